@@ -21,6 +21,7 @@ from src.utils.http import (
     LambdaResponse,
     error_response,
     json_response,
+    parse_json_body,
     translate_exceptions,
 )
 
@@ -35,8 +36,9 @@ from src.utils.http import (
 #   3. Parse request body { "url": "<string>" }
 #   4. Fetch metadata from upstream source
 #   5. Upload packaged artifact to S3
-#   6. Save metadata to DynamoDB
-#   7. Return ArtifactResponse (metadata + data.url + data.download_url)
+#   6. Score models (metrics read the uploaded files from S3)
+#   7. Save metadata to DynamoDB
+#   8. Return ArtifactResponse (metadata + data.url + data.download_url)
 #
 # Status codes:
 #   202 - TODO: Implement: artifact ingest accepted; rating deferred
@@ -86,7 +88,7 @@ def lambda_handler(
     # Step 2 — Parse request body
     # ---------------------------------------------------------------------
     try:
-        body = json.loads(event.get("body") or "{}")
+        body = parse_json_body(event)
     except json.JSONDecodeError:
         return error_response(
             400,
@@ -108,7 +110,9 @@ def lambda_handler(
     # Step 3 — Fetch upstream metadata and create artifact object
     # ---------------------------------------------------------------------
     try:
-        artifact = BaseArtifact.from_url(url, artifact_type)
+        # Scoring waits until Step 5: metrics read the artifact's files from S3,
+        # which only exist once the upload below succeeds
+        artifact = BaseArtifact.from_url(url, artifact_type, auto_score=False)
     except FileDownloadError as e:
         # The metadata-fetching process can raise FileDownloadError
         logger.error(
@@ -156,7 +160,12 @@ def lambda_handler(
         )
 
     # ---------------------------------------------------------------------
-    # Step 5 — Save metadata to DynamoDB
+    # Step 5 — Score models now that their files are in S3
+    # ---------------------------------------------------------------------
+    artifact.score()
+
+    # ---------------------------------------------------------------------
+    # Step 6 — Save metadata to DynamoDB
     # ---------------------------------------------------------------------
     try:
         save_artifact_metadata(artifact)
@@ -169,7 +178,7 @@ def lambda_handler(
         )
 
     # ---------------------------------------------------------------------
-    # Step 6 — Build ArtifactResponse
+    # Step 7 — Build ArtifactResponse
     # ---------------------------------------------------------------------
     response_body = {
         "metadata": {
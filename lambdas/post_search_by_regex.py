@@ -1,24 +1,658 @@
 """
-Lambda function for POST /artifact/byRegEx endpoint
-Search artifacts using regular expressions
+POST /artifact/byRegEx
+Search artifacts using a regular expression over artifact names and their
+string-valued metadata (descriptions, READMEs, etc.).
+
+User patterns run on Python's backtracking `re` engine, where some patterns
+(e.g. `(a+)+$`) take exponential time on a non-matching string. Any valid
+pattern is accepted; the cost of one request is bounded by the paged scan,
+the optional result `limit` and the function timeout, not by the pattern.
 """
 
+from __future__ import annotations
+
 import json
-from typing import Any, Dict
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from src.artifacts.types import ArtifactType
+from src.auth import AuthContext, auth_required
+from src.aws.clients import get_dynamodb_client
+from src.logger import logger, with_logging
+from src.settings import ARTIFACTS_TABLE
+from src.utils.http import (
+    LambdaResponse,
+    error_response,
+    json_response,
+    parse_json_body,
+    translate_exceptions,
+)
+
+try:
+    from re import _parser as sre_parse  # type: ignore[attr-defined]  # Python 3.11+
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse  # type: ignore[no-redef]
+
+try:
+    # Optional: Hyperscan DFA engine used as a fast prefilter for regex matching
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None  # type: ignore[assignment]
+
+# Number of DynamoDB parallel-scan segments (one worker thread each)
+SCAN_SEGMENTS = 4
+
+# Per-page Scan item cap when a result limit is requested: `limit` times this
+# factor, but never fewer than MIN_SCAN_PAGE_SIZE items per page
+SCAN_PAGE_FACTOR = 4
+MIN_SCAN_PAGE_SIZE = 100
+
+# Compiled patterns kept across warm invocations (LRU, keyed by pattern + flags)
+REGEX_CACHE_SIZE = 128
+
+# Characters whose re.IGNORECASE class is not closed under str.casefold():
+# `re` treats I/i/İ/ı as one class, but casefold() keeps I/i apart from the
+# Turkish dotted/dotless forms. Literal runs are cut at these characters so
+# the casefolded substring pre-check never rejects a real match. Derived by
+# grouping every code point by the case-insensitive class `re` compiles
+# (see tests/lambdas/test_post_search_by_regex.py).
+_CASEFOLD_UNSAFE = frozenset("Iiİı")
+
+# Non-ASCII characters re.IGNORECASE treats as case variants of ASCII letters
+_ASCII_EXTRA_CASES = {"i": "\u0130\u0131", "k": "\u212a", "s": "\u017f"}
+
+# Global flags a pattern may set and still be translated for Hyperscan
+_HS_TRANSLATABLE_FLAGS = re.IGNORECASE | re.UNICODE | re.VERBOSE
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+def _extract_required_literals(pattern: str) -> List[str]:
+    """
+    Return the runs of literal characters that every match of the pattern
+    must contain, casefolded for comparison against casefolded text.
+
+    Only top-level LITERAL tokens are collected; anything else (classes,
+    groups, quantified items, alternations) ends the current run, since its
+    contents are not guaranteed to appear in a match. Characters in
+    _CASEFOLD_UNSAFE end the run too: casefolding cannot compare them the
+    way re.IGNORECASE does.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return []
+
+    literals: List[str] = []
+    run: List[str] = []
+
+    for op, arg in parsed:
+        if op is sre_parse.LITERAL and chr(arg) not in _CASEFOLD_UNSAFE:
+            run.append(chr(arg))
+            continue
+        if run:
+            literals.append("".join(run).casefold())
+            run = []
+
+    if run:
+        literals.append("".join(run).casefold())
+
+    return literals
+
+
+def _hs_variants(cp: int) -> Optional[List[int]]:
+    """
+    Return every code point re.IGNORECASE matches for `cp`, or None when
+    that set is not known here (cased non-ASCII characters).
+    """
+    ch = chr(cp)
+    if ch.isascii() and ch.isalpha():
+        lower = ch.lower()
+        return [
+            ord(c) for c in lower + lower.upper() + _ASCII_EXTRA_CASES.get(lower, "")
+        ]
+    if ch.lower() != ch or ch.upper() != ch or ch in _CASEFOLD_UNSAFE:
+        return None
+    return [cp]
+
+
+def _hs_char(cp: int) -> str:
+    """Escape one code point unambiguously for PCRE in UTF-8 mode."""
+    return f"\\x{{{cp:x}}}"
+
+
+def _hs_class_items(items: List[Tuple[Any, Any]]) -> Optional[str]:
+    """Translate the members of a parsed character class ([...])."""
+    out: List[str] = []
+    for op, arg in items:
+        if op is sre_parse.NEGATE:
+            out.append("^")
+        elif op is sre_parse.LITERAL:
+            variants = _hs_variants(arg)
+            if variants is None:
+                return None
+            out.extend(_hs_char(v) for v in variants)
+        elif op is sre_parse.RANGE:
+            lo, hi = arg
+            if hi >= 0x80:
+                return None
+            out.append(f"{_hs_char(lo)}-{_hs_char(hi)}")
+            for cp in range(lo, hi + 1):
+                variants = _hs_variants(cp) or []
+                out.extend(_hs_char(v) for v in variants if v != cp)
+        else:
+            return None
+    return "[" + "".join(out) + "]"
+
+
+def _hs_translate(parsed: Any) -> Optional[str]:
+    """
+    Re-emit a parsed pattern as explicit PCRE that Hyperscan reads exactly
+    the way Python `re` reads the original.
+
+    Literals are written as \\x{...} escapes with their case variants spelled
+    out, so no CASELESS flag is needed. Returns None for anything outside
+    the supported subset (lookarounds, backreferences, scoped flags, \\b,
+    \\d/\\w/\\s and cased non-ASCII literals), whose meaning differs between
+    the dialects or cannot be confirmed here.
+    """
+    out: List[str] = []
+    for op, arg in parsed:
+        piece: Optional[str]
+        if op is sre_parse.LITERAL:
+            variants = _hs_variants(arg)
+            if variants is None:
+                return None
+            piece = (
+                _hs_char(arg)
+                if len(variants) == 1
+                else _hs_class_items([(sre_parse.LITERAL, arg)])
+            )
+        elif op is sre_parse.NOT_LITERAL:
+            piece = _hs_class_items(
+                [(sre_parse.NEGATE, None), (sre_parse.LITERAL, arg)]
+            )
+        elif op is sre_parse.ANY:
+            piece = "."
+        elif op is sre_parse.IN:
+            piece = _hs_class_items(arg)
+        elif op is sre_parse.MAX_REPEAT or op is sre_parse.MIN_REPEAT:
+            lo, hi, sub = arg
+            inner = _hs_translate(sub)
+            if inner is None:
+                return None
+            bound = f"{{{lo},}}" if hi is sre_parse.MAXREPEAT else f"{{{lo},{hi}}}"
+            lazy = "?" if op is sre_parse.MIN_REPEAT else ""
+            piece = f"(?:{inner}){bound}{lazy}"
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = arg
+            inner = None if add_flags or del_flags else _hs_translate(sub)
+            piece = None if inner is None else f"(?:{inner})"
+        elif op is sre_parse.BRANCH:
+            alternatives = [_hs_translate(alt) for alt in arg[1]]
+            if any(alt is None for alt in alternatives):
+                return None
+            piece = "(?:" + "|".join(cast(List[str], alternatives)) + ")"
+        elif op is sre_parse.AT:
+            piece = {
+                sre_parse.AT_BEGINNING: "^",
+                sre_parse.AT_BEGINNING_STRING: "\\A",
+                sre_parse.AT_END: "$",
+                sre_parse.AT_END_STRING: "\\z",
+            }.get(arg)
+        else:
+            piece = None
+
+        if piece is None:
+            return None
+        out.append(piece)
+
+    return "".join(out)
+
+
+def _to_hyperscan_pattern(pattern: str) -> Optional[str]:
+    """
+    Translate a user pattern for the Hyperscan prefilter, or return None if
+    it uses a construct that cannot be carried over exactly.
+
+    Hyperscan parses PCRE, not Python `re`, and the dialects disagree on
+    some spellings (Python reads `a{,3}` as `a{0,3}`, PCRE as literal
+    text). Compiling from the sre_parse tree instead of the raw string
+    removes any dependence on surface syntax.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except re.error:
+        return None
+
+    if parsed.state.flags & ~_HS_TRANSLATABLE_FLAGS:
+        return None
+
+    return _hs_translate(parsed)
+
+
+def _compile_prefilter(pattern: str) -> Optional[Any]:
+    """
+    Compile the pattern into a Hyperscan database, or return None when
+    Hyperscan is unavailable, the pattern cannot be translated exactly (see
+    _to_hyperscan_pattern()) or Hyperscan rejects it (e.g. patterns that
+    match the empty string).
+
+    PREFILTER guarantees no false negatives (every match is reported), so
+    Hyperscan hits are confirmed with `re` while misses are rejected
+    outright. Case-insensitivity is already spelled out in the translated
+    pattern, so CASELESS is not set.
+    """
+    if hyperscan is None:
+        return None
+
+    translated = _to_hyperscan_pattern(pattern)
+    if translated is None:
+        return None
+
+    flags = (
+        hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_PREFILTER
+    )
+    database = hyperscan.Database()
+    try:
+        database.compile(expressions=[translated.encode("utf-8")], flags=[flags])
+    except hyperscan.error as e:
+        logger.debug(f"[search_by_regex] Hyperscan unavailable for pattern: {e}")
+        return None
+
+    return database
+
+
+class _CompiledPattern(NamedTuple):
+    """Everything derived from a user pattern that is reusable across requests."""
+
+    regex: re.Pattern[str]
+    database: Optional[Any]
+    literals: List[str]
+
+
+_REGEX_CACHE: "OrderedDict[Tuple[str, int], _CompiledPattern]" = OrderedDict()
+
+
+def _get_compiled(pattern: str, flags: int = re.IGNORECASE) -> _CompiledPattern:
+    """
+    Return the compiled regex, Hyperscan database and required literals for
+    a pattern, reusing them across warm Lambda invocations. Clients often
+    repeat the same pattern (paginated UIs, retries), and the Hyperscan
+    compile in particular is far more expensive than a scan.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression.
+    """
+    key = (pattern, flags)
+    cached = _REGEX_CACHE.get(key)
+    if cached is not None:
+        _REGEX_CACHE.move_to_end(key)
+        return cached
+
+    compiled = _CompiledPattern(
+        regex=re.compile(pattern, flags),
+        database=_compile_prefilter(pattern),
+        literals=_extract_required_literals(pattern),
+    )
 
+    _REGEX_CACHE[key] = compiled
+    if len(_REGEX_CACHE) > REGEX_CACHE_SIZE:
+        _REGEX_CACHE.popitem(last=False)
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    return compiled
+
+
+def _stop_on_match(*_: Any) -> bool:
+    """Hyperscan match handler: returning True terminates the scan."""
+    return True
+
+
+def _make_search(
+    regex: re.Pattern[str],
+    database: Optional[Any],
+    literals: List[str],
+) -> Callable[[str], Any]:
+    """
+    Build the per-worker search callable.
+
+    Text that does not contain every required literal is rejected with
+    plain substring checks before any regex engine runs. Without a
+    Hyperscan database the remaining text goes to regex.search; otherwise
+    Hyperscan rejects non-matching text and `re` confirms candidate
+    matches. Each worker gets its own scratch space since Hyperscan
+    scratch may not be shared between threads.
+    """
+    _search = regex.search
+    match: Callable[[str], Any] = _search
+
+    if database is not None:
+        scratch = hyperscan.Scratch(database)
+        _scan = database.scan
+
+        def hs_match(text: str) -> Any:
+            try:
+                _scan(
+                    text.encode("utf-8"),
+                    match_event_handler=_stop_on_match,
+                    scratch=scratch,
+                )
+            except hyperscan.ScanTerminated:
+                return _search(text)
+            return None
+
+        match = hs_match
+
+    if not literals:
+        return match
+
+    def search(text: str) -> Any:
+        folded = text.casefold()
+        for literal in literals:
+            if literal not in folded:
+                return None
+        return match(text)
+
+    return search
+
+
+def _item_matches(search: Callable[[str], Any], item: Dict[str, Any]) -> bool:
     """
-    Stub handler for POST /artifact/byRegEx - Search by regex
-    Search for artifacts using regular expression over names and READMEs
+    Return True if the search callable matches the item's name or any
+    string-valued metadata entry.
+
+    `item` is a raw low-level DynamoDB item ({"name": {"S": ...},
+    "metadata": {"M": {...}}}). Only the string values that are actually
+    searched are pulled out, and metadata is only walked when the name does
+    not already match. Each field is searched on its own so no combined
+    text blob is ever built.
+    """
+    name = item.get("name")
+    if name is not None:
+        text = name.get("S")
+        if text is not None and search(text):
+            return True
+
+    metadata = item.get("metadata")
+    if metadata is None:
+        return False
+
+    entries = metadata.get("M")
+    if entries is None:
+        return False
+
+    for value in entries.values():
+        text = value.get("S")
+        if text is not None and search(text):
+            return True
+
+    return False
+
+
+def _to_artifact_metadata(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a raw DynamoDB artifact item into an ArtifactMetadata response entry.
     """
     return {
-        "statusCode": 200,
-        "headers": {"Content-Type": "application/json"},
-        "body": json.dumps(
-            [
-                {"name": "audience-classifier", "id": "3847247294", "type": "model"},
-                {"name": "bert-base-uncased", "id": "9078563412", "type": "model"},
-            ]
-        ),
+        "name": item.get("name", {}).get("S"),
+        "id": item.get("artifact_id", {}).get("S"),
+        "type": item.get("artifact_type", {}).get("S"),
     }
+
+
+def _scan_segment(
+    client: Any,
+    scan_kwargs: Dict[str, Any],
+    segment: int,
+    total_segments: int,
+    regex: re.Pattern[str],
+    database: Optional[Any],
+    literals: List[str],
+    stop: threading.Event,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Scan one parallel-scan segment page by page, yielding matching raw items.
+    Stops requesting further pages once `stop` is set.
+    """
+    kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+    _search = _make_search(regex, database, literals)
+
+    while not stop.is_set():
+        response = client.scan(**kwargs)
+
+        for item in response.get("Items", []):
+            if _item_matches(_search, item):
+                yield item
+
+        if "LastEvaluatedKey" not in response:
+            return
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def search_artifacts_by_regex(
+    pattern: str,
+    artifact_type: Optional[ArtifactType] = None,
+    limit: Optional[int] = None,
+    total_segments: int = SCAN_SEGMENTS,
+    search_metadata: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Scan the artifacts table and return ArtifactMetadata entries whose name
+    or string metadata matches the (case-insensitive) regex.
+
+    Only the attributes needed for matching and the response are projected.
+    With search_metadata=False the (potentially large) metadata map is left
+    out of the projection entirely and only names are matched.
+
+    The table is read with a DynamoDB parallel Scan: each segment is paged
+    by its own worker thread. Once `limit` matches have been collected the
+    remaining workers stop before fetching their next page. When a limit
+    is given, each page is also capped at max(limit * SCAN_PAGE_FACTOR,
+    MIN_SCAN_PAGE_SIZE) items instead of DynamoDB's 1 MB default. That
+    bounds the latency of any single Scan call and lets workers notice
+    the stop signal sooner.
+
+    The artifact_type filter is evaluated server-side by DynamoDB so that
+    non-matching items never leave the table. The scan goes through the
+    low-level client, so items are never run through TypeDeserializer;
+    only the string values that get searched or returned are read.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression.
+    """
+    regex, database, literals = _get_compiled(pattern)
+    client = get_dynamodb_client()
+
+    projection = "#n, artifact_id, artifact_type"
+    if search_metadata:
+        projection += ", metadata"
+
+    scan_kwargs: Dict[str, Any] = {
+        "TableName": ARTIFACTS_TABLE,
+        "ProjectionExpression": projection,
+        "ExpressionAttributeNames": {"#n": "name"},
+    }
+    if artifact_type:
+        scan_kwargs["FilterExpression"] = "artifact_type = :t"
+        scan_kwargs["ExpressionAttributeValues"] = {":t": {"S": artifact_type}}
+    if limit is not None:
+        scan_kwargs["Limit"] = max(limit * SCAN_PAGE_FACTOR, MIN_SCAN_PAGE_SIZE)
+
+    matches: Deque[Dict[str, Any]] = deque()
+    stop = threading.Event()
+
+    def worker(segment: int) -> None:
+        for item in _scan_segment(
+            client,
+            scan_kwargs,
+            segment,
+            total_segments,
+            regex,
+            database,
+            literals,
+            stop,
+        ):
+            matches.append(_to_artifact_metadata(item))
+            if limit is not None and len(matches) >= limit:
+                stop.set()
+            if stop.is_set():
+                return
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        futures = [executor.submit(worker, s) for s in range(total_segments)]
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except Exception:
+            stop.set()
+            for future in futures:
+                future.cancel()
+            raise
+
+    results = list(matches)
+    return results[:limit] if limit is not None else results
+
+
+# =============================================================================
+# Lambda Handler: POST /artifact/byRegEx
+# =============================================================================
+#
+# Responsibilities:
+#   1. Authenticate caller
+#   2. Parse request body { "regex": "<string>", "artifact_type": "<optional>",
+#      "limit": <optional positive int>, "search_metadata": <optional bool> }
+#   3. Scan DynamoDB for artifacts matching the regex
+#   4. Return list of ArtifactMetadata per spec
+#
+# Error codes:
+#   400 - malformed JSON, missing/invalid regex, invalid artifact_type,
+#         invalid limit or search_metadata
+#   403 - auth failure (handled by @auth_required)
+#   404 - no artifact matched the regex
+#   500 - unexpected errors (handled by @translate_exceptions)
+# =============================================================================
+
+
+@translate_exceptions
+@with_logging
+@auth_required
+def lambda_handler(
+    event: Dict[str, Any],
+    context: Any,
+    auth: AuthContext,
+) -> LambdaResponse:
+    logger.info("[search_by_regex] Handling POST /artifact/byRegEx")
+
+    # ---------------------------------------------------------------------
+    # Step 1 — Parse request body
+    # ---------------------------------------------------------------------
+    try:
+        body = parse_json_body(event)
+    except json.JSONDecodeError:
+        return error_response(
+            400,
+            "Request body must be valid JSON",
+            error_code="INVALID_JSON",
+        )
+
+    if not isinstance(body, dict):
+        return error_response(
+            400,
+            "Request body must be a JSON object",
+            error_code="INVALID_REQUEST",
+        )
+
+    pattern = body.get("regex")
+    if not isinstance(pattern, str) or not pattern:
+        return error_response(
+            400,
+            "Missing required field 'regex'",
+            error_code="INVALID_REQUEST",
+        )
+
+    artifact_type_raw = body.get("artifact_type")
+    if artifact_type_raw is not None and artifact_type_raw not in (
+        "model",
+        "dataset",
+        "code",
+    ):
+        return error_response(
+            400,
+            f"Invalid artifact_type '{artifact_type_raw}'",
+            error_code="INVALID_ARTIFACT_TYPE",
+        )
+    artifact_type = cast(Optional[ArtifactType], artifact_type_raw)
+
+    # Optional: stop scanning once `limit` matches are found
+    limit = body.get("limit")
+    if limit is not None and (
+        not isinstance(limit, int) or isinstance(limit, bool) or limit < 1
+    ):
+        return error_response(
+            400,
+            "Field 'limit' must be a positive integer",
+            error_code="INVALID_REQUEST",
+        )
+
+    # Optional: match names only, leaving metadata out of the Scan
+    search_metadata = body.get("search_metadata", True)
+    if not isinstance(search_metadata, bool):
+        return error_response(
+            400,
+            "Field 'search_metadata' must be a boolean",
+            error_code="INVALID_REQUEST",
+        )
+
+    logger.debug(
+        f"[search_by_regex] regex={pattern!r}, artifact_type={artifact_type}, "
+        f"limit={limit}, search_metadata={search_metadata}"
+    )
+
+    # ---------------------------------------------------------------------
+    # Step 2 — Scan for matching artifacts
+    # ---------------------------------------------------------------------
+    try:
+        artifacts = search_artifacts_by_regex(
+            pattern,
+            artifact_type=artifact_type,
+            limit=limit,
+            search_metadata=search_metadata,
+        )
+    except re.error as e:
+        return error_response(
+            400,
+            f"Invalid regular expression: {e}",
+            error_code="INVALID_REGEX",
+        )
+
+    if not artifacts:
+        return error_response(
+            404,
+            "No artifact found under this regex",
+            error_code="NOT_FOUND",
+        )
+
+    logger.info(f"[search_by_regex] Found {len(artifacts)} matching artifact(s)")
+
+    # ---------------------------------------------------------------------
+    # Step 3 — Return ArtifactMetadata list
+    # ---------------------------------------------------------------------
+    return json_response(200, artifacts)
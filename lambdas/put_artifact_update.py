@@ -1,19 +1,231 @@
 """
-Lambda function for PUT /artifacts/{artifact_type}/{id} endpoint
-Update existing artifact
+PUT /artifacts/{artifact_type}/{id}
+Update an existing artifact's stored fields in place.
 """
 
+from __future__ import annotations
+
 import json
-from typing import Any, Dict
+from decimal import Decimal
+from typing import Any, Dict, Tuple
+
+from botocore.exceptions import ClientError
+
+from src.auth import AuthContext, auth_required
+from src.aws.clients import get_ddb_table
+from src.logger import logger, with_logging
+from src.settings import ARTIFACTS_TABLE
+from src.utils.http import (
+    LambdaResponse,
+    error_response,
+    json_response,
+    parse_json_body,
+    translate_exceptions,
+)
 
+# Top-level artifact attributes a client is allowed to overwrite
+UPDATABLE_FIELDS = ("name", "source_url", "metadata")
 
-def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+
+# =============================================================================
+# Helpers
+# =============================================================================
+def _to_dynamo_value(value: Any) -> Any:
     """
-    Stub handler for PUT /artifacts/{artifact_type}/{id} - Update artifact
-    Update the content of an existing artifact
+    Convert parsed JSON into values accepted by the boto3 DynamoDB resource
+    (which rejects Python floats).
     """
-    return {
-        "statusCode": 200,
-        "headers": {"Content-Type": "application/json"},
-        "body": json.dumps({"message": "Artifact updated successfully"}),
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_dynamo_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_dynamo_value(v) for v in value]
+    return value
+
+
+def _build_update_expression(
+    updates: Dict[str, Any],
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """
+    Build a DynamoDB SET expression for the given field updates.
+
+    Top-level fields are overwritten. `metadata` is shallow-merged
+    server-side by setting each key as a nested attribute
+    (SET metadata.#mk = :mv), so untouched metadata keys are preserved.
+
+    Returns:
+        (UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues)
+    """
+    assignments = []
+    names: Dict[str, str] = {}
+    values: Dict[str, Any] = {}
+
+    for i, (field, value) in enumerate(updates.items()):
+        if field == "metadata":
+            for j, (meta_key, meta_value) in enumerate(value.items()):
+                names[f"#mk{j}"] = meta_key
+                values[f":mv{j}"] = _to_dynamo_value(meta_value)
+                assignments.append(f"metadata.#mk{j} = :mv{j}")
+            continue
+
+        names[f"#k{i}"] = field
+        values[f":v{i}"] = _to_dynamo_value(value)
+        assignments.append(f"#k{i} = :v{i}")
+
+    return "SET " + ", ".join(assignments), names, values
+
+
+# =============================================================================
+# Lambda Handler: PUT /artifacts/{artifact_type}/{id}
+# =============================================================================
+#
+# Responsibilities:
+#   1. Authenticate caller
+#   2. Validate path parameters
+#   3. Parse request body { "name"?, "source_url"?, "metadata"? }
+#   4. Apply the update with a single conditional UpdateItem
+#   5. Return the updated Artifact
+#
+# Error codes:
+#   400 - missing/invalid path parameters or body
+#   403 - auth failure (handled by @auth_required)
+#   404 - artifact not found
+#   409 - artifact exists but has a different artifact_type
+#   500 - unexpected errors (handled by @translate_exceptions)
+# =============================================================================
+
+
+@translate_exceptions
+@with_logging
+@auth_required
+def lambda_handler(
+    event: Dict[str, Any],
+    context: Any,
+    auth: AuthContext,
+) -> LambdaResponse:
+    logger.info("[put_artifact] Handling PUT /artifacts/{artifact_type}/{id}")
+
+    # ---------------------------------------------------------------------
+    # Step 1 — Extract and validate path parameters
+    # ---------------------------------------------------------------------
+    path_params = event.get("pathParameters") or {}
+    artifact_type = path_params.get("artifact_type")
+    artifact_id = path_params.get("id")
+
+    if not artifact_type or not artifact_id:
+        return error_response(
+            400,
+            "Missing required path parameters: artifact_type or id",
+            error_code="INVALID_REQUEST",
+        )
+
+    if artifact_type not in ("model", "dataset", "code"):
+        return error_response(
+            400,
+            f"Invalid artifact_type '{artifact_type}'",
+            error_code="INVALID_ARTIFACT_TYPE",
+        )
+
+    # ---------------------------------------------------------------------
+    # Step 2 — Parse request body and keep only updatable fields
+    # ---------------------------------------------------------------------
+    try:
+        body = parse_json_body(event)
+    except json.JSONDecodeError:
+        return error_response(
+            400,
+            "Request body must be valid JSON",
+            error_code="INVALID_JSON",
+        )
+
+    if not isinstance(body, dict):
+        return error_response(
+            400,
+            "Request body must be a JSON object",
+            error_code="INVALID_REQUEST",
+        )
+
+    updates = {k: body[k] for k in UPDATABLE_FIELDS if k in body}
+
+    if "name" in updates and (
+        not isinstance(updates["name"], str) or not updates["name"]
+    ):
+        return error_response(
+            400,
+            "Field 'name' must be a non-empty string",
+            error_code="INVALID_REQUEST",
+        )
+
+    if "metadata" in updates:
+        if not isinstance(updates["metadata"], dict):
+            return error_response(
+                400,
+                "Field 'metadata' must be an object",
+                error_code="INVALID_REQUEST",
+            )
+        if not updates["metadata"]:
+            updates.pop("metadata")
+
+    if not updates:
+        return error_response(
+            400,
+            f"No updatable fields provided (allowed: {', '.join(UPDATABLE_FIELDS)})",
+            error_code="INVALID_REQUEST",
+        )
+
+    logger.debug(f"[put_artifact] artifact_id={artifact_id}, fields={sorted(updates)}")
+
+    # ---------------------------------------------------------------------
+    # Step 3 — Conditional UpdateItem (existence + type check in-flight)
+    # ---------------------------------------------------------------------
+    update_expression, names, values = _build_update_expression(updates)
+    values[":t"] = artifact_type
+
+    table = get_ddb_table(ARTIFACTS_TABLE)
+
+    try:
+        resp = table.update_item(
+            Key={"artifact_id": artifact_id},
+            UpdateExpression=update_expression,
+            ConditionExpression="attribute_exists(artifact_id) AND artifact_type = :t",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            raise
+
+        # ALL_OLD distinguishes "missing" from "exists with another type"
+        if e.response.get("Item"):
+            return error_response(
+                409,
+                f"Artifact '{artifact_id}' is not of type '{artifact_type}'",
+                error_code="TYPE_MISMATCH",
+            )
+        return error_response(
+            404,
+            f"Artifact '{artifact_id}' does not exist",
+            error_code="NOT_FOUND",
+        )
+
+    item = resp.get("Attributes", {})
+    logger.info(f"[put_artifact] Updated artifact {artifact_id}")
+
+    # ---------------------------------------------------------------------
+    # Step 4 — Build the returned Artifact object
+    # ---------------------------------------------------------------------
+    response_body = {
+        "metadata": {
+            "name": item.get("name"),
+            "id": item.get("artifact_id"),
+            "type": item.get("artifact_type"),
+        },
+        "data": {
+            "url": item.get("source_url"),
+        },
     }
+
+    return json_response(200, response_body)
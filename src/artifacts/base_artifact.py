@@ -102,13 +102,18 @@ class BaseArtifact(ABC):
         return artifact
 
     @classmethod
-    def from_url(cls, url: str, artifact_type: ArtifactType) -> "BaseArtifact":
+    def from_url(
+        cls, url: str, artifact_type: ArtifactType, auto_score: bool = True
+    ) -> "BaseArtifact":
         """
         Create an artifact by fetching metadata from external source (HuggingFace or GitHub).
 
         Args:
             url: URL to artifact (HuggingFace model/dataset or GitHub repo)
             artifact_type: One of 'model', 'dataset', 'code'
+            auto_score: For models, whether to compute scores on creation.
+                Pass False when the artifact's files are not in S3 yet and
+                call score() once they are.
 
         Returns:
             Instance of appropriate artifact subclass with fetched metadata
@@ -130,6 +135,8 @@ class BaseArtifact(ABC):
 
         # Ensure source_url is set
         metadata["source_url"] = url
+        if artifact_type == "model":
+            metadata["auto_score"] = auto_score
 
         # Create artifact using factory method
         artifact = cls.create(artifact_type, **metadata)
@@ -139,6 +146,12 @@ class BaseArtifact(ABC):
 
         return artifact
 
+    def score(self) -> None:
+        """
+        Compute the artifact's quality scores. Only models are scored;
+        other artifact types have nothing to compute.
+        """
+
     @abstractmethod
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -102,6 +102,12 @@ class ModelArtifact(BaseArtifact):
         else:
             logger.debug(f"Skipping auto-score for model artifact: {self.artifact_id}")
 
+    def score(self) -> None:
+        """
+        Compute (or recompute) scores from the artifact's files in S3.
+        """
+        self._compute_scores()
+
     def _compute_scores(self) -> None:
         """
         Populate scores and scores_latency by running each metric in parallel.
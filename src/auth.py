@@ -5,12 +5,12 @@ import time
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, TypedDict
 
-import boto3
 import urllib3
 from botocore.exceptions import ClientError
 from jose import jwk, jwt
 from jose.utils import base64url_decode
 
+from src.aws.clients import get_cognito, get_ddb_table
 from src.logger import logger
 from src.utils.http import LambdaResponse, error_response
 
@@ -23,10 +23,8 @@ USER_POOL_ID = os.environ["USER_POOL_ID"]
 USER_POOL_CLIENT_ID = os.environ["USER_POOL_CLIENT_ID"]
 TOKENS_TABLE = os.environ["TOKENS_TABLE"]
 
-ddb = boto3.resource("dynamodb")
-tokens_table = ddb.Table(TOKENS_TABLE)
-
-cognito = boto3.client("cognito-idp")
+# AWS clients are created lazily (and cached) by src.aws.clients, so requests
+# rejected before token lookup never pay boto3 initialization cost.
 http = urllib3.PoolManager()
 
 # ====================================================================================
@@ -71,7 +69,7 @@ def authenticate_user(username: str, password: str) -> dict:
     try:
         logger.info(f"[auth] Authenticating user {username} via Cognito")
 
-        resp = cognito.initiate_auth(
+        resp = get_cognito().initiate_auth(
             AuthFlow="USER_PASSWORD_AUTH",
             ClientId=USER_POOL_CLIENT_ID,
             AuthParameters={"USERNAME": username, "PASSWORD": password},
@@ -81,7 +79,7 @@ def authenticate_user(username: str, password: str) -> dict:
         access_token = auth["AccessToken"]
 
         # Store token for TTL + usage-limit rules
-        tokens_table.put_item(
+        get_ddb_table(TOKENS_TABLE).put_item(
             Item={
                 "token": access_token,
                 "username": username,
@@ -134,6 +132,7 @@ def verify_token(token: str) -> dict:
         raise Exception("Token expired (JWT exp claim)")
 
     # Step 3 — TTL enforcement
+    tokens_table = get_ddb_table(TOKENS_TABLE)
     raw_item = tokens_table.get_item(Key={"token": token}).get("Item")
     if raw_item is None:
         raise Exception("Token not registered or invalid")
@@ -203,10 +202,12 @@ def authorize(
     if not token_header:
         raise Exception("Missing X-Authorization header")
 
-    if not token_header.lower().startswith("bearer "):
+    # Compare only the 7-byte prefix rather than lowercasing the whole
+    # (potentially kilobytes-long) header
+    if token_header[:7].lower() != "bearer ":
         raise Exception("Malformed token (must start with 'bearer ')")
 
-    raw_token = token_header.split(" ", 1)[1].strip()
+    raw_token = token_header[7:].strip()
 
     claims = verify_token(raw_token)
 
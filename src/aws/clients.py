@@ -5,19 +5,51 @@ Used by all Lambda functions to avoid repeating boilerplate.
 
 from __future__ import annotations
 
+import functools
 from typing import Any, Optional
 
 import boto3
+from botocore.config import Config
 from mypy_boto3_cognito_idp.client import CognitoIdentityProviderClient
+from mypy_boto3_dynamodb.client import DynamoDBClient
 from mypy_boto3_dynamodb.service_resource import DynamoDBServiceResource
 from mypy_boto3_s3 import S3Client
 
 from src.settings import AWS_REGION
 
+# =====================================================================================
+# Shared client configuration
+# =====================================================================================
+# Parallel-scan workers share one DynamoDB resource/client, so the connection pool must
+# be larger than botocore's default of 10. Adaptive retries back off client-side
+# when DynamoDB throttles instead of retrying immediately.
+DYNAMODB_CONFIG = Config(
+    max_pool_connections=16,
+    retries={"max_attempts": 2, "mode": "adaptive"},
+)
+
+# Metrics call Bedrock concurrently from worker threads; keep-alive lets
+# repeated invoke_model calls reuse the same TLS connection. Adaptive retries
+# back off on Bedrock throttling instead of adding to the 429 rate. A short
+# connect timeout fails fast on a bad endpoint.
+#
+# read_timeout bounds each socket read (each event when streaming), not a whole
+# call, so it is sized for long non-streaming generations rather than for the
+# Lambda timeout; the function's own timeout (template.yaml) still caps the
+# invocation as a whole, and ask_llm() turns a timeout into a None result.
+BEDROCK_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"total_max_attempts": 4, "mode": "adaptive"},
+    connect_timeout=3,
+    read_timeout=120,
+    tcp_keepalive=True,
+)
+
 # =====================================================================================
 # Lazy-initialized client caches
 # =====================================================================================
 _dynamodb_resource: Optional[DynamoDBServiceResource] = None
+_dynamodb_client: Optional[DynamoDBClient] = None
 _s3_client: Optional[S3Client] = None
 _cognito_client: Optional[CognitoIdentityProviderClient] = None
 
@@ -35,15 +67,39 @@ def get_dynamodb() -> DynamoDBServiceResource:
         raise RuntimeError("boto3 is not available in this environment")
 
     if _dynamodb_resource is None:
-        _dynamodb_resource = boto3.resource("dynamodb", region_name=AWS_REGION)  # type: ignore
+        _dynamodb_resource = boto3.resource(  # type: ignore
+            "dynamodb", region_name=AWS_REGION, config=DYNAMODB_CONFIG
+        )
 
     return _dynamodb_resource
 
 
+def get_dynamodb_client() -> DynamoDBClient:
+    """
+    Returns a cached low-level DynamoDB client.
+
+    Items come back in raw wire format ({"S": ...}, {"M": ...}) without
+    TypeDeserializer conversion, for hot paths that only read a few fields.
+    """
+    global _dynamodb_client
+
+    if boto3 is None:
+        raise RuntimeError("boto3 is not available in this environment")
+
+    if _dynamodb_client is None:
+        _dynamodb_client = boto3.client(
+            "dynamodb", region_name=AWS_REGION, config=DYNAMODB_CONFIG
+        )
+
+    return _dynamodb_client
+
+
+@functools.lru_cache(maxsize=16)
 def get_ddb_table(table_name: str) -> Any:
     """
     Convenience wrapper for DynamoDB table access.
-    Returns a boto3 Table object.
+    Returns a boto3 Table object, memoized per table name so warm
+    invocations reuse it instead of rebuilding it on every request.
     """
     dynamo: DynamoDBServiceResource = get_dynamodb()
     return dynamo.Table(table_name)  # type: ignore[no-any-return]
@@ -83,3 +139,19 @@ def get_cognito() -> CognitoIdentityProviderClient:
         _cognito_client = boto3.client("cognito-idp", region_name=AWS_REGION)
 
     return _cognito_client
+
+
+# =====================================================================================
+# Bedrock
+# =====================================================================================
+@functools.lru_cache(maxsize=4)
+def get_bedrock_runtime(region: Optional[str] = None) -> Any:
+    """
+    Returns a cached Bedrock runtime client for the region (default: AWS_REGION).
+    """
+    if boto3 is None:
+        raise RuntimeError("boto3 is not available in this environment")
+
+    return boto3.client(
+        "bedrock-runtime", region_name=region or AWS_REGION, config=BEDROCK_CONFIG
+    )
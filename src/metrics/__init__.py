@@ -1,6 +1,6 @@
 """Package initialization for metrics."""
 
-from .metric import Metric
+from .metric import Metric, score_all_metrics_async
 from .availability_metric import AvailabilityMetric
 from .bus_factor_metric import BusFactorMetric
 from .code_quality_metric import CodeQualityMetric
@@ -26,4 +26,5 @@ __all__ = [
     "ReproducibilityMetric",
     "ReviewednessMetric",
     "TreescoreMetric",
+    "score_all_metrics_async",
 ]
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Union, Dict
 
+from src.logger import logger
+from src.storage import s3_utils
+from src.utils.llm_analysis import ask_llm, build_file_analysis_prompt, score_schema
+
 from .metric import Metric
 
 if TYPE_CHECKING:
@@ -12,8 +16,9 @@ class CodeQualityMetric(Metric):
     """
     Code quality metric for evaluating code quality.
 
-    This is a stub implementation that will be filled out when
-    S3 and SageMaker/Bedrock integration is available.
+    Loads a bounded set of source and documentation files from the
+    artifact tarball in S3 (streamed and extracted in memory, cached per
+    object version) and asks the LLM to rate them.
     """
 
     def score(self, model: ModelArtifact) -> Union[float, Dict[str, float]]:
@@ -26,6 +31,34 @@ class CodeQualityMetric(Metric):
         Returns:
             Code quality score as a dictionary
         """
-        # TODO: Implement actual code quality scoring when S3 integration is ready
-        # For now, return a placeholder score
-        return {"code_quality": 0.5}
+        # Shared per artifact version with any other metric reading its files
+        files = s3_utils.load_artifact_files(model.artifact_id, model.s3_key)
+
+        if not files:
+            logger.warning(
+                f"[code_quality] No analyzable files in artifact {model.artifact_id}"
+            )
+            return {"code_quality": 0.0}
+
+        prompt = build_file_analysis_prompt("code quality", "code_quality", files)
+        # The schema forces a tool-call answer, so the reply is always valid
+        # JSON and only needs a handful of output tokens
+        result = ask_llm(
+            prompt,
+            max_tokens=64,
+            return_json=True,
+            json_schema=score_schema("code_quality"),
+        )
+
+        if not isinstance(result, dict):
+            logger.warning(
+                f"[code_quality] No usable LLM response for {model.artifact_id}"
+            )
+            return {"code_quality": 0.0}
+
+        try:
+            value = float(result.get("code_quality", 0.0))
+        except (TypeError, ValueError):
+            value = 0.0
+
+        return {"code_quality": min(max(value, 0.0), 1.0)}
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Union, Dict
+from typing import TYPE_CHECKING, Union, Dict, List, Sequence
 
 if TYPE_CHECKING:
     from src.artifacts import ModelArtifact
@@ -25,3 +26,32 @@ class Metric(ABC):
             Either a float score or a dictionary of scores
         """
         pass
+
+    async def score_async(self, model: ModelArtifact) -> Union[float, Dict[str, float]]:
+        """
+        Awaitable score(). Runs the (typically I/O-bound) score() in a worker
+        thread so several metrics can be awaited concurrently.
+
+        Args:
+            model: The ModelArtifact object to score
+
+        Returns:
+            Either a float score or a dictionary of scores
+        """
+        return await asyncio.to_thread(self.score, model)
+
+
+async def score_all_metrics_async(
+    model: ModelArtifact, metrics: Sequence[Metric]
+) -> List[Union[float, Dict[str, float]]]:
+    """
+    Score a model with every metric concurrently.
+
+    Args:
+        model: The ModelArtifact object to score
+        metrics: Metrics to run
+
+    Returns:
+        One result per metric, in the same order as `metrics`
+    """
+    return list(await asyncio.gather(*(m.score_async(model) for m in metrics)))
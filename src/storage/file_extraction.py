@@ -0,0 +1,175 @@
+"""
+Artifact tarball file extraction utilities.
+
+This module pulls a small, bounded set of text files (READMEs first, then
+source/config files) out of an artifact .tar.gz so they can be analyzed
+by metrics without unpacking the whole archive to disk. Archives can be
+read from a local path or directly from a file-like object such as an S3
+StreamingBody.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import os
+import tarfile
+from typing import Any, Dict, Iterable, List, Tuple
+
+from src.logger import logger
+
+# File extensions treated as text worth analyzing
+DEFAULT_INCLUDE_EXT: Tuple[str, ...] = (
+    ".py",
+    ".md",
+    ".rst",
+    ".txt",
+    ".json",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".cfg",
+    ".ini",
+    ".js",
+    ".ts",
+    ".ipynb",
+)
+
+DEFAULT_MAX_FILES = 20
+DEFAULT_MAX_CHARS = 20_000
+
+
+# =====================================================================================
+# Helpers
+# =====================================================================================
+def _is_readme_lower(lower_name: str) -> bool:
+    """
+    is_readme() for a path that has already been lowercased.
+    """
+    return lower_name.rpartition("/")[2].startswith("readme")
+
+
+def is_readme(name: str) -> bool:
+    """
+    Return True if the path refers to a README file (any extension).
+    """
+    return _is_readme_lower(os.path.basename(name).lower())
+
+
+def _select_members(
+    tar: tarfile.TarFile,
+    max_files: int,
+    max_chars: int,
+    include_ext: Iterable[str],
+) -> Dict[str, str]:
+    """
+    Walk a streaming-mode TarFile once and return the best `max_files` members.
+    """
+    # Sorted list of ((readme_rank, path), name, content), bounded to max_files
+    selected: List[Tuple[Tuple[int, str], str, str]] = []
+
+    # str.endswith(tuple) checks every suffix in a single C-level call
+    suffixes = tuple(ext.lower() for ext in include_ext)
+
+    for member in tar:
+        if not member.isfile():
+            continue
+
+        lower = member.name.lower()
+        readme = _is_readme_lower(lower)
+        if not readme and not lower.endswith(suffixes):
+            continue
+
+        if not readme and member.size > max_chars * 4:
+            continue
+
+        key = (0 if readme else 1, lower)
+        if len(selected) >= max_files and key >= selected[-1][0]:
+            continue
+
+        fileobj = tar.extractfile(member)
+        if fileobj is None:
+            continue
+
+        content = fileobj.read(max_chars).decode("utf-8", errors="ignore")
+
+        bisect.insort(selected, (key, member.name, content))
+        if len(selected) > max_files:
+            selected.pop()
+
+    return {name: content for _, name, content in selected}
+
+
+# =====================================================================================
+# Extraction
+# =====================================================================================
+def extract_relevant_files(
+    tar_path: str,
+    max_files: int = DEFAULT_MAX_FILES,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    include_ext: Iterable[str] = DEFAULT_INCLUDE_EXT,
+) -> Dict[str, str]:
+    """
+    Extract up to `max_files` text files from a .tar.gz archive.
+
+    The archive is read once in streaming mode. READMEs are preferred, then
+    files are ordered by path. A member is only read (and decoded) if it
+    currently ranks within the best `max_files`, and at most `max_chars`
+    bytes of it are read. Non-README members larger than `max_chars * 4`
+    bytes are skipped outright since little of them would survive truncation.
+
+    Args:
+        tar_path: Path to a local .tar.gz archive
+        max_files: Maximum number of files to return
+        max_chars: Maximum characters kept per file
+        include_ext: File extensions treated as text
+
+    Returns:
+        Mapping of archive member name → (truncated) file contents,
+        READMEs first.
+    """
+    if max_files <= 0:
+        return {}
+
+    with tarfile.open(tar_path, "r|gz") as tar:
+        files = _select_members(tar, max_files, max_chars, include_ext)
+
+    logger.debug(f"[file_extraction] Selected {len(files)} file(s) from {tar_path}")
+
+    return files
+
+
+def extract_files_from_tar_stream(
+    fileobj: Any,
+    max_files: int = DEFAULT_MAX_FILES,
+    max_chars: int = DEFAULT_MAX_CHARS,
+    include_ext: Iterable[str] = DEFAULT_INCLUDE_EXT,
+) -> Dict[str, str]:
+    """
+    Extract up to `max_files` text files from a gzipped tar byte stream.
+
+    Same selection rules as extract_relevant_files(), but the archive is
+    decompressed on the fly from `fileobj` (e.g. an S3 StreamingBody), so
+    nothing is written to local disk. The stream is consumed forward-only
+    and is not closed.
+
+    Args:
+        fileobj: Readable binary stream of a .tar.gz archive
+        max_files: Maximum number of files to return
+        max_chars: Maximum characters kept per file
+        include_ext: File extensions treated as text
+
+    Returns:
+        Mapping of archive member name → (truncated) file contents,
+        READMEs first.
+    """
+    if max_files <= 0:
+        return {}
+
+    with gzip.GzipFile(fileobj=fileobj, mode="rb") as gz:
+        with tarfile.open(fileobj=gz, mode="r|") as tar:
+            files = _select_members(tar, max_files, max_chars, include_ext)
+
+    logger.debug(f"[file_extraction] Selected {len(files)} file(s) from stream")
+
+    return files
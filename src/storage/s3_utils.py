@@ -2,19 +2,23 @@
 S3 storage utilities for artifact files.
 This module provides:
 - Uploading local files to S3
-- Downloading S3 files locally
+- Downloading S3 files locally (or streaming them without touching disk)
+- Extracting (and caching) an artifact's text files straight from S3
 - Generating presigned download URLs
 - Bulk deletion utilities (clear_bucket, delete_prefix, delete_objects)
 """
 
 from __future__ import annotations
 
+import functools
 import os
-from typing import Iterable, Optional
+import shutil
+from typing import Dict, Iterable, Optional
 
 from mypy_boto3_s3 import S3Client
 from mypy_boto3_s3.type_defs import ObjectIdentifierTypeDef
 from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 
 from src.artifacts.types import ArtifactType
 from src.aws.clients import get_s3
@@ -24,6 +28,7 @@ from src.storage.downloaders.dispatchers import (
     FileDownloadError as SourceDownloadError,
     download_artifact,
 )
+from src.storage.file_extraction import extract_files_from_tar_stream
 
 
 # =====================================================================================
@@ -157,20 +162,104 @@ def upload_artifact_to_s3(
 def download_artifact_from_s3(
     artifact_id: str,
     s3_key: str,
-    local_path: str,
-) -> None:
+    local_path: Optional[str] = None,
+    if_match: Optional[str] = None,
+) -> Optional[StreamingBody]:
     """
-    Download an artifact from S3 into a local file.
+    Download an artifact from S3.
+
+    If `local_path` is given the object is written to that file and None is
+    returned. Otherwise the object is not downloaded; its StreamingBody is
+    returned for the caller to read (and close) directly.
+
+    With `if_match`, S3 rejects the request (412) unless the object's ETag
+    equals it, so the caller gets exactly the version it asked for. The
+    managed transfer behind download_file() cannot send IfMatch, so a
+    conditional download to `local_path` streams the object to disk instead.
     """
     if not ARTIFACTS_BUCKET:
         raise ValueError("ARTIFACTS_BUCKET environment variable not set")
 
+    if local_path is not None and not if_match:
+        logger.debug(
+            f"[s3_utils] Downloading artifact {artifact_id}: "
+            f"s3://{ARTIFACTS_BUCKET}/{s3_key} → {local_path}"
+        )
+        download_file(s3_key, local_path)
+        return None
+
     logger.debug(
-        f"[s3_utils] Downloading artifact {artifact_id}: "
-        f"s3://{ARTIFACTS_BUCKET}/{s3_key} → {local_path}"
+        f"[s3_utils] Streaming artifact {artifact_id}: "
+        f"s3://{ARTIFACTS_BUCKET}/{s3_key} → {local_path or 'caller'}"
     )
 
-    download_file(s3_key, local_path)
+    s3: S3Client = get_s3()
+
+    try:
+        if if_match:
+            response = s3.get_object(
+                Bucket=ARTIFACTS_BUCKET, Key=s3_key, IfMatch=if_match
+            )
+        else:
+            response = s3.get_object(Bucket=ARTIFACTS_BUCKET, Key=s3_key)
+    except ClientError as e:
+        logger.error(
+            f"[s3_utils] Failed to open s3://{ARTIFACTS_BUCKET}/{s3_key}: {e}",
+            exc_info=True,
+        )
+        raise
+
+    body = response["Body"]
+    if local_path is None:
+        return body
+
+    try:
+        with open(local_path, "wb") as f:
+            shutil.copyfileobj(body, f)
+    finally:
+        body.close()
+    logger.info(f"Downloaded: s3://{ARTIFACTS_BUCKET}/{s3_key}")
+    return None
+
+
+# =====================================================================================
+# High-level: S3 → extracted text files (cached per object version)
+# =====================================================================================
+@functools.lru_cache(maxsize=8)
+def get_artifact_files(artifact_id: str, s3_key: str, etag: str) -> Dict[str, str]:
+    """
+    Stream the artifact tarball at `s3_key` and extract its relevant text
+    files (see extract_files_from_tar_stream()). Memoized per object version,
+    so metrics scoring the same artifact version share one download.
+
+    The returned dict is shared between callers and must not be mutated;
+    use load_artifact_files() for a private copy.
+    """
+    logger.debug(f"[s3_utils] Extracting files from {s3_key} (etag={etag})")
+
+    # IfMatch guarantees the cached result belongs to exactly this version
+    body = download_artifact_from_s3(artifact_id, s3_key, if_match=etag)
+    if body is None:
+        raise RuntimeError("download_artifact_from_s3() returned None unexpectedly")
+    try:
+        return extract_files_from_tar_stream(body)
+    finally:
+        body.close()
+
+
+def load_artifact_files(artifact_id: str, s3_key: str) -> Dict[str, str]:
+    """
+    Return the relevant text files of artifact `artifact_id`, currently
+    stored at `s3_key`. A HEAD request fetches the object's ETag; the download and
+    extraction are skipped when that version was already extracted.
+    """
+    if not ARTIFACTS_BUCKET:
+        raise ValueError("ARTIFACTS_BUCKET environment variable not set")
+
+    s3: S3Client = get_s3()
+    etag = s3.head_object(Bucket=ARTIFACTS_BUCKET, Key=s3_key)["ETag"]
+
+    return dict(get_artifact_files(artifact_id, s3_key, etag))
 
 
 # =====================================================================================
@@ -5,12 +5,20 @@ Provides consistent JSON responses, error formatting, and CORS headers.
 
 from __future__ import annotations
 
+import base64
+import binascii
 import json
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, TypedDict, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, TypedDict, TypeVar, Union
 
 from src.logger import logger
 
+try:
+    # orjson is 2-3x faster than stdlib json for API Gateway payloads
+    import orjson
+except ImportError:  # pragma: no cover - fall back to stdlib json
+    orjson = None  # type: ignore[assignment]
+
 F = TypeVar("F", bound=Callable[..., Any])
 
 
@@ -23,6 +31,45 @@ class LambdaResponse(TypedDict):
     body: str
 
 
+# -----------------------------------------------------------------------------
+# JSON encode/decode (orjson when available, stdlib json otherwise)
+# -----------------------------------------------------------------------------
+def dumps_json(value: Any) -> str:
+    """
+    Serialize a value to a JSON string suitable for an API Gateway body.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value)
+
+
+def parse_json_body(event: Dict[str, Any]) -> Any:
+    """
+    Parse the JSON body of an API Gateway event.
+    A missing or empty body is treated as an empty object.
+
+    Base64-encoded bodies (isBase64Encoded) are decoded straight to bytes
+    and parsed from bytes, without an intermediate str copy.
+
+    Raises:
+        json.JSONDecodeError: If the body is not valid JSON or valid base64
+            (orjson.JSONDecodeError is a subclass).
+    """
+    raw_body: Union[str, bytes, None] = event.get("body")
+    if not raw_body:
+        return {}
+
+    if event.get("isBase64Encoded"):
+        try:
+            raw_body = base64.b64decode(raw_body, validate=True)
+        except binascii.Error as e:
+            raise json.JSONDecodeError(f"Invalid base64 body: {e}", "", 0) from e
+
+    if orjson is not None:
+        return orjson.loads(raw_body)
+    return json.loads(raw_body)
+
+
 # -----------------------------------------------------------------------------
 # Default CORS headers (shared by all responses)
 # -----------------------------------------------------------------------------
@@ -42,12 +89,13 @@ DEFAULT_HEADERS: Dict[str, str] = {
 # -----------------------------------------------------------------------------
 def json_response(
     status_code: int,
-    body: Union[Dict[str, Any], str, bool],
+    body: Union[Dict[str, Any], List[Any], str, bool],
     headers: Optional[Dict[str, str]] = None,
 ) -> LambdaResponse:
     """
     Build a standardized JSON response object for API Gateway.
-    Body may be a dict (usual case) or a raw JSON string (as required by some spec responses).
+    Body may be a dict (usual case), a list (e.g. search results), or a raw JSON
+    string (as required by some spec responses).
     """
     combined_headers = DEFAULT_HEADERS.copy()
     if headers:
@@ -56,7 +104,7 @@ def json_response(
     return LambdaResponse(
         statusCode=status_code,
         headers=combined_headers,
-        body=json.dumps(body),
+        body=dumps_json(body),
     )
 
 
@@ -3,71 +3,747 @@ AWS Bedrock utilities for LLM analysis.
 Simple functions for any type of analysis using foundation models.
 """
 
+import asyncio
+import hashlib
+import io
+import itertools
 import json
 import os
-import boto3  # type: ignore[import-untyped]
-from botocore.exceptions import ClientError  # type: ignore[import-untyped]
-from typing import Dict, Any, Optional, List, Union
+import re
+import threading
+import time
+import tokenize
+from collections import OrderedDict
+from functools import lru_cache
+from botocore.exceptions import BotoCoreError, ClientError  # type: ignore[import-untyped]
+from typing import Dict, Any, Iterable, Optional, List, Tuple, Union
 
+from src.aws.clients import get_bedrock_runtime
 from src.logger import logger
+from src.utils.semantic_cache import DEFAULT_THRESHOLD, SemanticCache
 
+try:
+    # orjson encodes/decodes Bedrock payloads 2-5x faster than stdlib json
+    import orjson
+except ImportError:  # pragma: no cover - fall back to stdlib json
+    orjson = None  # type: ignore[assignment]
 
-# Module-level client - reused across all function calls
-_bedrock_client = None
+try:
+    # Optional: exact token counts for the prompt input budget
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None  # type: ignore[assignment]
+
+
+# Exact-prompt response cache, enabled with MODELGUARD_LLM_CACHE=1.
+# Keyed by (model_id, max_tokens, return_json, sha256(prompt)); values are
+# (stored_at, response). MODELGUARD_LLM_CACHE_TTL (seconds, 0 = no expiry)
+# bounds how long an entry is served.
+LLM_CACHE_SIZE = 256
+_llm_cache: "OrderedDict[Tuple[str, int, bool, str], Tuple[float, Any]]" = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+# Embedding-similarity cache consulted after an exact-cache miss, enabled with
+# MODELGUARD_LLM_SEMANTIC_CACHE=1 (requires numpy).
+# MODELGUARD_LLM_SEMANTIC_THRESHOLD sets the minimum cosine similarity and
+# MODELGUARD_LLM_CACHE_DIR, if set, persists entries across processes.
+EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v2:0"
+# Titan v2 input limit; longer prompts bypass the semantic cache
+EMBEDDING_MAX_CHARS = 50_000
+_semantic_cache: Optional[SemanticCache] = None
+
+# File-analysis prompt budget. Files longer than CONDENSE_MAX_CHARS keep only
+# their first and last CONDENSE_EDGE_CHARS characters.
+DEFAULT_MAX_INPUT_TOKENS = 8000
+CONDENSE_MAX_CHARS = 4096
+CONDENSE_EDGE_CHARS = 2048
+
+# Generated/vendored files that say nothing about the repository's quality
+_GENERATED_SUFFIXES = (
+    ".min.js",
+    ".min.css",
+    ".lock",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+)
+
+# Block comments (group 1), or the string/template literals they may not
+# start inside; literals are matched only so they can be kept verbatim
+_JS_BLOCK_COMMENT_RE = re.compile(
+    r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|`(?:\\.|[^`\\])*`|(/\*.*?\*/)',
+    re.DOTALL,
+)
+_JS_LINE_COMMENT_RE = re.compile(r"^\s*//.*$", re.MULTILINE)
+
+# Long unbroken base64 runs (embedded images, data URIs, pickled weights)
+_BASE64_BLOB_RE = re.compile(r"[A-Za-z0-9+/]{200,}={0,2}")
+# Runs of spaces/tabs after the first non-blank character of a line; leading
+# indentation is kept so code samples in READMEs stay intact
+_PROSE_SPACES_RE = re.compile(r"(?<=\S)[ \t]+")
+_PROSE_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+# Content whose sampled printable-character ratio falls below this is treated
+# as a binary file that was extracted by mistake
+BINARY_PRINTABLE_RATIO = 0.9
+_BINARY_SAMPLE_CHARS = 1024
+
+# Tool the model is forced to call when a JSON schema is supplied
+RESULT_TOOL_NAME = "submit_result"
+
+
+def _dumps(value: Any) -> Union[bytes, str]:
+    """Serialize compactly (no whitespace); boto3 accepts bytes or str."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or str without decoding bytes first.
+
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+            (orjson.JSONDecodeError is a subclass).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 # Return value should be more specific once we have boto3 stubs setup with MyPy
 def _get_bedrock_client() -> Any:
-    """Get or create singleton Bedrock runtime client."""
-    global _bedrock_client
-    if _bedrock_client is None:
-        region = os.getenv("BEDROCK_REGION", "us-east-2")
-        _bedrock_client = boto3.client("bedrock-runtime", region_name=region)
-    return _bedrock_client
+    """Get the shared, memoized Bedrock runtime client for BEDROCK_REGION."""
+    return get_bedrock_runtime(os.getenv("BEDROCK_REGION", "us-east-2"))
+
+
+class _JsonValueTracker:
+    """
+    Incrementally scan streamed text for the end of the first top-level
+    JSON object or array. Tracks bracket depth, ignoring brackets inside
+    strings, so an array reply is returned whole rather than cut at its
+    first element.
+    """
+
+    def __init__(self) -> None:
+        self.pos = 0
+        self.start = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> Optional[Tuple[int, int]]:
+        """
+        Consume the next piece of text. Returns the (start, end) span of the
+        value within all text fed so far once its closing bracket is seen.
+        """
+        for ch in text:
+            i = self.pos
+            self.pos += 1
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == "{" or ch == "[":
+                if self.start < 0:
+                    self.start = i
+                self.depth += 1
+            elif self.start < 0:
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "}" or ch == "]":
+                self.depth -= 1
+                if self.depth == 0:
+                    return self.start, i + 1
+
+        return None
+
+
+def _ask_llm_streaming_json(client: Any, model_id: str, body: Union[bytes, str]) -> Any:
+    """
+    Stream a response and parse the first JSON object or array as soon as
+    it is complete, closing the stream without waiting for the remaining
+    tokens.
+
+    Raises:
+        json.JSONDecodeError: If no valid JSON value is produced.
+    """
+    response = client.invoke_model_with_response_stream(modelId=model_id, body=body)
+    stream = response["body"]
+
+    parts: List[str] = []
+    tracker = _JsonValueTracker()
+
+    try:
+        for event in stream:
+            chunk = event.get("chunk")
+            if chunk is None:
+                continue
+
+            data = _loads(chunk["bytes"])
+            delta = data.get("delta", {})
+
+            if data.get("type") == "content_block_delta":
+                # Plain text arrives as "text"; forced tool calls as "partial_json"
+                text = delta.get("text") or delta.get("partial_json", "")
+            elif delta.get("stop_reason") == "stop_sequence":
+                # The matched stop sequence (e.g. the closing "}") is not part
+                # of the generated text; put it back so the JSON is complete
+                text = delta.get("stop_sequence") or ""
+            else:
+                continue
+
+            parts.append(text)
+
+            span = tracker.feed(text)
+            if span is not None:
+                start, end = span
+                return _loads("".join(parts)[start:end])
+    finally:
+        stream.close()
+
+    # Stream ended without a complete value: parse whatever was produced
+    return _loads("".join(parts))
+
+
+def _ask_llm_uncached(
+    prompt: str,
+    max_tokens: int,
+    return_json: bool,
+    model_id: str,
+    json_schema: Optional[Dict[str, Any]] = None,
+    stop_sequences: Optional[List[str]] = None,
+    temperature: float = 0.0,
+) -> Optional[Union[str, Dict[str, Any]]]:
+    """
+    Invoke the model once; see ask_llm() for arguments and return value.
+
+    JSON requests are streamed when BEDROCK_INFERENCE_PROFILE_ARN is set
+    (streaming requires an inference profile); otherwise, and for plain
+    text requests, the whole response is awaited with invoke_model.
+    """
+    request_body: Dict[str, Any] = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if stop_sequences:
+        request_body["stop_sequences"] = list(stop_sequences)
+
+    use_tool = return_json and json_schema is not None
+    if use_tool:
+        request_body["tools"] = [
+            {
+                "name": RESULT_TOOL_NAME,
+                "description": "Submit the requested result.",
+                "input_schema": json_schema,
+            }
+        ]
+        request_body["tool_choice"] = {"type": "tool", "name": RESULT_TOOL_NAME}
+
+    body = _dumps(request_body)
+    profile_arn = os.getenv("BEDROCK_INFERENCE_PROFILE_ARN")
+
+    try:
+        client = _get_bedrock_client()
+
+        if return_json and profile_arn:
+            try:
+                return _ask_llm_streaming_json(client, profile_arn, body)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response: {e}")
+                return None
+
+        response = client.invoke_model(modelId=model_id, body=body)
+
+        # Parse the raw UTF-8 bytes directly; decoding to str first would
+        # only copy the whole body once more
+        result = _loads(response["body"].read())
+
+        if use_tool:
+            # The forced tool call's input is already schema-shaped JSON
+            for block in result["content"]:
+                if block.get("type") == "tool_use":
+                    return block["input"]
+            logger.error("Bedrock response contained no tool_use block")
+            return None
+
+        content = result["content"][0]["text"]
+
+        # The matched stop sequence is not included in the text; restore it
+        # so e.g. a JSON object cut at its closing "}" still parses
+        if result.get("stop_reason") == "stop_sequence" and result.get("stop_sequence"):
+            content += result["stop_sequence"]
+
+        if return_json:
+            try:
+                return _loads(content)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response: {e}")
+                logger.debug("Raw response: {}", content)
+                return None
+
+        return content
+
+    except (BotoCoreError, ClientError, json.JSONDecodeError, KeyError) as e:
+        logger.error(f"Bedrock request failed: {e}")
+        return None
+
+
+def _exact_cache_get(
+    key: Tuple[str, int, bool, str],
+) -> Optional[Union[str, Dict[str, Any]]]:
+    """Return a live exact-cache entry for the key, or None."""
+    ttl = float(os.getenv("MODELGUARD_LLM_CACHE_TTL", "0"))
+
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if ttl and time.monotonic() - stored_at >= ttl:
+            del _llm_cache[key]
+            return None
+
+        _llm_cache.move_to_end(key)
+        logger.debug("[llm] Cache hit")
+        return value
+
+
+def _exact_cache_put(
+    key: Tuple[str, int, bool, str], value: Union[str, Dict[str, Any]]
+) -> None:
+    """Store a response in the exact cache, evicting the oldest entry if full."""
+    with _llm_cache_lock:
+        _llm_cache[key] = (time.monotonic(), value)
+        _llm_cache.move_to_end(key)
+        if len(_llm_cache) > LLM_CACHE_SIZE:
+            _llm_cache.popitem(last=False)
+
+
+def _get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the shared semantic cache, or None if disabled/unavailable."""
+    global _semantic_cache
+
+    if os.getenv("MODELGUARD_LLM_SEMANTIC_CACHE") != "1":
+        return None
+
+    if not SemanticCache.available():
+        logger.debug("[llm] numpy not installed; semantic cache disabled")
+        return None
+
+    with _llm_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache(
+                threshold=float(
+                    os.getenv("MODELGUARD_LLM_SEMANTIC_THRESHOLD", DEFAULT_THRESHOLD)
+                ),
+                cache_dir=os.getenv("MODELGUARD_LLM_CACHE_DIR") or None,
+            )
+        return _semantic_cache
+
+
+def _embed(text: str) -> Optional[List[float]]:
+    """Embed text with Titan embeddings; None if too long or the call fails."""
+    if len(text) > EMBEDDING_MAX_CHARS:
+        return None
+
+    try:
+        response = _get_bedrock_client().invoke_model(
+            modelId=EMBEDDING_MODEL_ID,
+            body=_dumps({"inputText": text}),
+        )
+        return _loads(response["body"].read())["embedding"]
+    except (BotoCoreError, ClientError, json.JSONDecodeError, KeyError) as e:
+        logger.warning(f"[llm] Embedding request failed: {e}")
+        return None
 
 
 def ask_llm(
-    prompt: str, max_tokens: int = 200, return_json: bool = False
+    prompt: str,
+    max_tokens: int = 200,
+    return_json: bool = False,
+    json_schema: Optional[Dict[str, Any]] = None,
+    stop_sequences: Optional[List[str]] = None,
+    temperature: float = 0.0,
 ) -> Optional[Union[str, Dict[str, Any]]]:
     """
     Ask the LLM a question and get a response.
 
+    Two optional in-process caches sit in front of Bedrock:
+    - MODELGUARD_LLM_CACHE=1: exact-prompt LRU (LLM_CACHE_SIZE entries)
+    - MODELGUARD_LLM_SEMANTIC_CACHE=1: embedding-similarity lookup that
+      also answers near-duplicate prompts
+    Use ask_llm.cache_clear() to empty them.
+
     Args:
         prompt: The question or instruction to send to the model
         max_tokens: Maximum tokens in the response
         return_json: If True, parse response as JSON
+        json_schema: Optional JSON Schema for return_json requests; the
+            model is then forced to answer through a tool call whose input
+            matches it, instead of free-form text
+        stop_sequences: Optional strings that end generation when emitted;
+            the matched sequence is kept at the end of the response
+        temperature: Sampling temperature (0 = deterministic)
 
     Returns:
         String response or parsed JSON dict, None if failed
     """
     model_id = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-haiku-4-5-20251001-v1:0")
 
+    use_exact = os.getenv("MODELGUARD_LLM_CACHE") == "1"
+    semantic = _get_semantic_cache()
+
+    def invoke() -> Optional[Union[str, Dict[str, Any]]]:
+        return _ask_llm_uncached(
+            prompt,
+            max_tokens,
+            return_json,
+            model_id,
+            json_schema,
+            stop_sequences,
+            temperature,
+        )
+
+    if not use_exact and semantic is None:
+        return invoke()
+
+    # Every option that changes the response is folded into the cache key
+    options_tag = hashlib.sha256(
+        json.dumps([json_schema, stop_sequences, temperature], sort_keys=True).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+    digest = hashlib.sha256(prompt.encode("utf-8"))
+    digest.update(options_tag.encode("ascii"))
+
+    key = (model_id, max_tokens, return_json, digest.hexdigest())
+
+    if use_exact:
+        cached = _exact_cache_get(key)
+        if cached is not None:
+            return cached
+
+    variant = f"{model_id}|{max_tokens}|{return_json}|{options_tag}"
+    embedding = _embed(prompt) if semantic is not None else None
+
+    if semantic is not None and embedding is not None:
+        cached = semantic.lookup(variant, embedding)
+        if cached is not None:
+            if use_exact:
+                _exact_cache_put(key, cached)
+            return cached
+
+    value = invoke()
+
+    # Failures are not cached so a transient error is retried next call
+    if value is not None:
+        if use_exact:
+            _exact_cache_put(key, value)
+        if semantic is not None and embedding is not None:
+            semantic.add(variant, embedding, value)
+
+    return value
+
+
+def _llm_cache_clear() -> None:
+    """Empty the in-process ask_llm() caches."""
+    global _semantic_cache
+
+    with _llm_cache_lock:
+        _llm_cache.clear()
+        _semantic_cache = None
+
+
+ask_llm.cache_clear = _llm_cache_clear  # type: ignore[attr-defined]
+
+
+async def ask_llm_async(
+    prompt: str,
+    max_tokens: int = 200,
+    return_json: bool = False,
+    json_schema: Optional[Dict[str, Any]] = None,
+    stop_sequences: Optional[List[str]] = None,
+    temperature: float = 0.0,
+) -> Optional[Union[str, Dict[str, Any]]]:
+    """
+    Awaitable ask_llm(); see it for arguments and return value.
+
+    The blocking Bedrock call runs in a worker thread (botocore releases the
+    GIL while waiting on the network), so several awaits gathered together
+    overlap their round-trips while sharing the pooled client and caches.
+    """
+    return await asyncio.to_thread(
+        ask_llm,
+        prompt,
+        max_tokens,
+        return_json,
+        json_schema,
+        stop_sequences,
+        temperature,
+    )
+
+
+def build_llm_prompt(
+    instructions: str,
+    sections: Optional[Union[Dict[str, str], Iterable[Tuple[str, str]]]] = None,
+) -> str:
+    """
+    Assemble a prompt from instructions followed by titled content sections.
+
+    Args:
+        instructions: Task description placed at the top of the prompt
+        sections: Optional (title, content) pairs, in order; a mapping of
+            title → content is also accepted. Iterated once, so a generator
+            works without materialising all sections first.
+
+    Returns:
+        The full prompt string
+    """
+    # Written straight into one buffer; no per-fragment list or join pass
+    buf = io.StringIO()
+    buf.write(instructions.strip())
+    buf.write("\n")
+
+    if isinstance(sections, dict):
+        sections = sections.items()
+
+    blocks = 1
+    for title, content in sections or ():
+        blocks += 1
+        buf.write("\n=== ")
+        buf.write(title)
+        buf.write(" ===\n")
+        buf.write(content)
+        buf.write("\n")
+
+    prompt = buf.getvalue()
+    logger.debug("[llm_prompt_builder] Built prompt with {} block(s)", blocks)
+    return prompt
+
+
+def _drop_blank_lines(lines: List[str]) -> str:
+    """Join lines back together, dropping blank ones and trailing whitespace."""
+    return "\n".join(line.rstrip() for line in lines if line.strip())
+
+
+def _condense_python(content: str) -> str:
+    """Strip comments, docstrings and blank lines from Python source."""
+    lines = content.split("\n")
     try:
-        client = _get_bedrock_client()
-        response = client.invoke_model(
-            modelId=model_id,
-            body=json.dumps(
-                {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": max_tokens,
-                    "messages": [{"role": "user", "content": prompt}],
-                }
-            ),
+        tokens = list(tokenize.generate_tokens(io.StringIO(content).readline))
+    except (tokenize.TokenError, SyntaxError):
+        # Truncated or invalid source: fall back to whole-line comments
+        return _drop_blank_lines(
+            [line for line in lines if not line.lstrip().startswith("#")]
         )
 
-        result = json.loads(response["body"].read().decode("utf-8"))
-        content = result["content"][0]["text"]
+    comment_cols: Dict[int, int] = {}
+    docstring_rows: set[int] = set()
+    skip = (tokenize.COMMENT, tokenize.NL)
+    statement_start = (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT)
+    prev_type = tokenize.NEWLINE
 
-        if return_json:
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {e}")
-                logger.debug(f"Raw response: {content}")
-                return None
+    for i, tok in enumerate(tokens):
+        if tok.type == tokenize.COMMENT:
+            comment_cols[tok.start[0]] = tok.start[1]
+            continue
+        if tok.type == tokenize.NL:
+            continue
 
-        return content
+        # A string that is a whole statement on its own is a docstring
+        if tok.type == tokenize.STRING and prev_type in statement_start:
+            rest = itertools.islice(tokens, i + 1, None)
+            following = next((t for t in rest if t.type not in skip), None)
+            if following is None or following.type in (
+                tokenize.NEWLINE,
+                tokenize.ENDMARKER,
+            ):
+                docstring_rows.update(range(tok.start[0], tok.end[0] + 1))
 
-    except (ClientError, json.JSONDecodeError, KeyError) as e:
-        logger.error(f"Bedrock request failed: {e}")
+        prev_type = tok.type
+
+    kept = []
+    for row, line in enumerate(lines, start=1):
+        if row in docstring_rows:
+            continue
+        if row in comment_cols:
+            line = line[: comment_cols[row]]
+        kept.append(line)
+
+    return _drop_blank_lines(kept)
+
+
+def _looks_binary(content: str) -> bool:
+    """Return True if too few of the leading characters are printable text."""
+    sample = content[:_BINARY_SAMPLE_CHARS]
+    if not sample:
+        return False
+    printable = sum(1 for ch in sample if ch.isprintable() or ch in "\n\t")
+    return printable / len(sample) < BINARY_PRINTABLE_RATIO
+
+
+def _minify_for_llm(fname: str, content: str) -> str:
+    """
+    Rewrite a file into fewer prompt tokens without changing what it says.
+
+    Strips a leading BOM, normalises line endings and elides base64 blobs for
+    every file. JSON is re-dumped compactly and Markdown/reST have runs of
+    blank lines and of non-leading spaces collapsed. Binary content is
+    replaced by a short placeholder.
+
+    Returns:
+        The minified content
+    """
+    content = content.lstrip("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+    if _looks_binary(content):
+        return f"<binary {len(content)} bytes elided>"
+
+    content = _BASE64_BLOB_RE.sub("<base64 elided>", content)
+
+    lower = fname.lower()
+    if lower.endswith(".json"):
+        try:
+            dumped = _dumps(_loads(content))
+            content = dumped.decode("utf-8") if isinstance(dumped, bytes) else dumped
+        except (ValueError, TypeError, RecursionError):
+            # Invalid or truncated JSON, or nesting too deep to re-encode
+            # (orjson's encoder stops at 255 levels); keep as-is
+            pass
+    elif lower.endswith((".md", ".rst")):
+        content = _PROSE_BLANK_LINES_RE.sub("\n\n", _PROSE_SPACES_RE.sub(" ", content))
+
+    return content
+
+
+def _condense(fname: str, content: str) -> str:
+    """
+    Shrink a file for inclusion in an LLM prompt while keeping its structure.
+
+    Generated files (minified bundles, lock files) are dropped entirely.
+    Python loses comments, docstrings and blank lines; JavaScript/TypeScript
+    lose comments and blank lines. Anything still longer than
+    CONDENSE_MAX_CHARS keeps only its head and tail.
+
+    Returns:
+        The condensed content ("" if the file should be skipped)
+    """
+    lower = fname.lower()
+    if lower.endswith(_GENERATED_SUFFIXES):
+        return ""
+
+    if lower.endswith(".py"):
+        content = _condense_python(content)
+    elif lower.endswith((".js", ".ts")):
+        content = _JS_BLOCK_COMMENT_RE.sub(
+            lambda m: "" if m.group(1) else m.group(0), content
+        )
+        content = _JS_LINE_COMMENT_RE.sub("", content)
+        content = _drop_blank_lines(content.split("\n"))
+
+    if len(content) > CONDENSE_MAX_CHARS:
+        content = (
+            content[:CONDENSE_EDGE_CHARS] + "\n...\n" + content[-CONDENSE_EDGE_CHARS:]
+        )
+
+    return content
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding() -> Any:
+    """Return the cl100k_base tiktoken encoding, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # pragma: no cover - e.g. BPE file download failed
+        logger.warning(f"[llm_prompt_builder] tiktoken unavailable: {e}")
         return None
+
+
+def _count_tokens(text: str) -> int:
+    """Count prompt tokens exactly with tiktoken, else estimate ~4 chars/token."""
+    encoding = _get_token_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+@lru_cache(maxsize=64)
+def _instructions(metric_name: str, score_name: str, score_range: str) -> str:
+    """Instruction block for build_file_analysis_prompt(), built once per metric."""
+    return f"""You are an expert evaluator of machine learning repositories.
+Assess the {metric_name} of the repository using the files below and assign
+a score in the range {score_range}.
+
+Return ONLY a JSON object of the exact form:
+{{ "{score_name}": <float {score_range}> }}"""
+
+
+def build_file_analysis_prompt(
+    metric_name: str,
+    score_name: str,
+    files: Union[Dict[str, str], Iterable[Tuple[str, str]]],
+    score_range: str = "[0.0, 1.0]",
+    max_input_tokens: int = DEFAULT_MAX_INPUT_TOKENS,
+) -> str:
+    """
+    Build a prompt asking the LLM to score repository files for one metric.
+
+    Each file is minified and condensed first (see _minify_for_llm() and
+    _condense()). Files are then added in order while they fit within
+    `max_input_tokens`; files that would overflow the budget are skipped.
+
+    Args:
+        metric_name: Human-readable metric name (e.g. "code quality")
+        score_name: JSON key the model must return the score under
+        files: (file name, file content) pairs, or a mapping of the same;
+            consumed lazily, one file at a time
+        score_range: Range the score must fall in
+        max_input_tokens: Token budget for the whole prompt
+
+    Returns:
+        The full prompt string
+    """
+    instructions = _instructions(metric_name, score_name, score_range)
+    budget = max_input_tokens - _count_tokens(instructions)
+    sections: List[Tuple[str, str]] = []
+
+    if isinstance(files, dict):
+        files = files.items()
+
+    for name, content in files:
+        condensed = _condense(name, _minify_for_llm(name, content))
+        if not condensed:
+            continue
+
+        title = f"FILE: {name}"
+        cost = _count_tokens(f"=== {title} ===\n{condensed}\n")
+        if cost > budget:
+            logger.debug("[llm_prompt_builder] Skipping {}: over token budget", name)
+            continue
+
+        sections.append((title, condensed))
+        budget -= cost
+
+    return build_llm_prompt(instructions, sections)
+
+
+def score_schema(score_name: str) -> Dict[str, Any]:
+    """
+    JSON Schema for a single-score result, e.g. {"code_quality": 0.82}.
+    Pass to ask_llm(json_schema=...) alongside build_file_analysis_prompt().
+    """
+    return {
+        "type": "object",
+        "properties": {score_name: {"type": "number", "minimum": 0, "maximum": 1}},
+        "required": [score_name],
+    }
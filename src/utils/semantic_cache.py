@@ -0,0 +1,228 @@
+"""
+Embedding-similarity cache for LLM responses.
+
+Stores (prompt embedding, response) pairs and answers a lookup with the
+stored response whose prompt embedding is most similar to the query,
+provided the cosine similarity reaches a threshold. Used by ask_llm() as a
+second tier behind the exact-prompt cache, for near-duplicate prompts.
+
+Embeddings are kept as one contiguous float32 matrix per request variant
+(model, max_tokens, return_json) with unit-length rows, so a lookup is a
+single matrix-vector product. The cache can be persisted to a directory as
+an `embeddings.npy` matrix plus an `entries.jsonl` sidecar (one line per
+row, in the same order). At most `max_entries` entries are kept; the oldest
+is evicted first, which bounds both memory and the per-insert copy/rewrite.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from src.logger import logger
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_MAX_ENTRIES = 1024
+
+_EMBEDDINGS_FILE = "embeddings.npy"
+_ENTRIES_FILE = "entries.jsonl"
+
+
+class SemanticCache:
+    """
+    Thread-safe nearest-neighbour cache over prompt embeddings.
+
+    Requires numpy; check `SemanticCache.available()` before constructing.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        cache_dir: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize the cache, loading any entries persisted in `cache_dir`.
+
+        Args:
+            threshold: Minimum cosine similarity for a lookup to hit
+            cache_dir: Optional directory to persist entries to
+            max_entries: Maximum number of entries kept across all variants
+        """
+        if np is None:
+            raise RuntimeError("numpy is required for the semantic LLM cache")
+
+        self.threshold = threshold
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+        # variant → (N, D) float32 matrix of unit-length rows
+        self._embeddings: Dict[str, Any] = {}
+        # variant → responses, parallel to the rows of _embeddings[variant]
+        self._responses: Dict[str, List[Any]] = {}
+        # Variant of every entry in global insertion order, used when saving
+        self._order: Deque[str] = deque()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            self._load()
+
+    @staticmethod
+    def available() -> bool:
+        """Return True if numpy is installed."""
+        return np is not None
+
+    # ---------------------------------------------------------------------
+    # Lookup / insert
+    # ---------------------------------------------------------------------
+    def lookup(self, variant: str, embedding: Sequence[float]) -> Optional[Any]:
+        """
+        Return the cached response most similar to `embedding`, or None if
+        no entry of this variant reaches the threshold.
+        """
+        query = self._normalize(embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            matrix = self._embeddings.get(variant)
+            if matrix is None or matrix.shape[1] != query.shape[0]:
+                return None
+
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity < self.threshold:
+                return None
+
+            logger.debug("[semantic_cache] Hit (similarity={:.3f})", similarity)
+            return self._responses[variant][best]
+
+    def add(self, variant: str, embedding: Sequence[float], response: Any) -> None:
+        """
+        Store a response under the given prompt embedding.
+        """
+        row = self._normalize(embedding)
+        if row is None:
+            return
+
+        with self._lock:
+            matrix = self._embeddings.get(variant)
+            if matrix is not None and matrix.shape[1] != row.shape[0]:
+                logger.debug(
+                    "[semantic_cache] Embedding dimension mismatch; not cached"
+                )
+                return
+
+            self._embeddings[variant] = (
+                row[np.newaxis, :] if matrix is None else np.vstack([matrix, row])
+            )
+            self._responses.setdefault(variant, []).append(response)
+            self._order.append(variant)
+            self._evict()
+
+            if self.cache_dir:
+                self._save()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._order)
+
+    # ---------------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[Any]:
+        """Return the embedding as a unit-length float32 vector (None if zero)."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or norm == 0.0:
+            return None
+        return vector / norm
+
+    def _evict(self) -> None:
+        """
+        Drop the oldest entries until at most max_entries remain. Rows of a
+        variant are stored in insertion order, so the oldest entry overall
+        is the first row of its variant. Caller must hold the lock.
+        """
+        while len(self._order) > self.max_entries:
+            variant = self._order.popleft()
+            self._responses[variant].pop(0)
+            if self._responses[variant]:
+                self._embeddings[variant] = self._embeddings[variant][1:]
+            else:
+                del self._embeddings[variant]
+                del self._responses[variant]
+
+    def _load(self) -> None:
+        """Load persisted entries from cache_dir, ignoring a missing/corrupt cache."""
+        assert self.cache_dir is not None
+        emb_path = os.path.join(self.cache_dir, _EMBEDDINGS_FILE)
+        entries_path = os.path.join(self.cache_dir, _ENTRIES_FILE)
+
+        if not (os.path.exists(emb_path) and os.path.exists(entries_path)):
+            return
+
+        try:
+            matrix = np.load(emb_path)
+            with open(entries_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            pairs = [(entry["variant"], entry["response"]) for entry in entries]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[semantic_cache] Ignoring unreadable cache: {e}")
+            return
+
+        if matrix.ndim != 2 or len(pairs) != matrix.shape[0]:
+            logger.warning("[semantic_cache] Ignoring inconsistent cache files")
+            return
+
+        rows: Dict[str, List[Any]] = {}
+        for row, (variant, response) in zip(matrix, pairs):
+            rows.setdefault(variant, []).append(row)
+            self._responses.setdefault(variant, []).append(response)
+            self._order.append(variant)
+
+        for variant, variant_rows in rows.items():
+            self._embeddings[variant] = np.vstack(variant_rows).astype(np.float32)
+
+        self._evict()
+
+        logger.info(f"[semantic_cache] Loaded {len(pairs)} entr(ies)")
+
+    def _save(self) -> None:
+        """
+        Rewrite both cache files in global insertion order so they always
+        stay consistent. Caller must hold the lock.
+        """
+        assert self.cache_dir is not None
+        offsets = {variant: 0 for variant in self._embeddings}
+        rows = []
+        lines = []
+        for variant in self._order:
+            index = offsets[variant]
+            offsets[variant] += 1
+            rows.append(self._embeddings[variant][index])
+            lines.append(
+                json.dumps(
+                    {"variant": variant, "response": self._responses[variant][index]}
+                )
+            )
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            np.save(os.path.join(self.cache_dir, _EMBEDDINGS_FILE), np.vstack(rows))
+            with open(
+                os.path.join(self.cache_dir, _ENTRIES_FILE), "w", encoding="utf-8"
+            ) as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.warning(f"[semantic_cache] Failed to persist cache: {e}")
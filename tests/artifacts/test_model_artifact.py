@@ -77,6 +77,17 @@ def test_compute_scores_parallel(model_artifact, mock_metrics):
     assert "NetScore" in model_artifact.scores_latency
 
 
+def test_score_computes_scores(model_artifact, mock_metrics):
+    """Ensure the public score() runs the metrics and fills in NetScore."""
+    from src.artifacts import model_artifact as ma_module
+
+    with patch.object(ma_module, "METRICS", mock_metrics):
+        model_artifact.score()
+
+    assert "NetScore" in model_artifact.scores
+    assert "NetScore" in model_artifact.scores_latency
+
+
 @patch("src.artifacts.model_artifact.METRICS", new_callable=list)
 def test_compute_scores_handles_exceptions(mock_metrics, model_artifact):
     """Verify that metric failures are handled gracefully."""
@@ -0,0 +1,14 @@
+import os
+
+# Environment src.settings requires at import time. Applied at conftest import,
+# before collection, so any module reading these at import sees them; values
+# already set in the real environment win.
+_TEST_ENV = {
+    "AWS_REGION": "us-east-2",
+    "ARTIFACTS_TABLE": "test-artifacts",
+    "TOKENS_TABLE": "test-tokens",
+    "ARTIFACTS_BUCKET": "test-bucket",
+    "USER_POOL_ID": "test-pool",
+    "USER_POOL_CLIENT_ID": "test-client",
+}
+os.environ.update({k: v for k, v in _TEST_ENV.items() if k not in os.environ})
@@ -0,0 +1,32 @@
+"""
+Shared setup for Lambda handler tests.
+
+src.auth downloads the Cognito JWKS at import time, so it is imported here
+once with that HTTP request patched out. Token verification is not under
+test in these modules; `authorize` is replaced for every test.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+with patch("urllib3.PoolManager.request") as _jwks_request:
+    _jwks_request.return_value.json.return_value = {"keys": []}
+    import src.auth
+
+
+@pytest.fixture(autouse=True)
+def authorized(monkeypatch):
+    auth = {"username": "tester", "claims": {}, "groups": [], "token": "t"}
+    monkeypatch.setattr(src.auth, "authorize", lambda event, allowed_roles=None: auth)
+    return auth
+
+
+def make_event(body=None, path_params=None):
+    """Build a minimal API Gateway proxy event."""
+    return {
+        "headers": {"X-Authorization": "bearer t"},
+        "pathParameters": path_params,
+        "body": None if body is None else json.dumps(body),
+    }
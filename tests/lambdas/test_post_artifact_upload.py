@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from lambdas import post_artifact_upload as handler
+from src.artifacts.model_artifact import ModelArtifact
+from src.storage.downloaders.dispatchers import FileDownloadError
+from tests.lambdas.conftest import make_event
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    """Record the order of upload, scoring and save for one ingest."""
+    calls = []
+    monkeypatch.setattr(
+        "src.artifacts.base_artifact.fetch_artifact_metadata",
+        lambda url, artifact_type: {"name": "demo-model"},
+    )
+    monkeypatch.setattr(
+        handler, "upload_artifact_to_s3", lambda **_: calls.append("upload")
+    )
+    monkeypatch.setattr(
+        ModelArtifact, "_compute_scores", lambda self: calls.append("score")
+    )
+    monkeypatch.setattr(
+        handler, "save_artifact_metadata", lambda artifact: calls.append("save")
+    )
+    return calls
+
+
+def _post(path_type="model"):
+    event = make_event(
+        body={"url": "https://huggingface.co/org/demo-model"},
+        path_params={"artifact_type": path_type},
+    )
+    return handler.lambda_handler(event, None)
+
+
+def test_model_is_scored_after_upload_and_before_save(ingest):
+    response = _post()
+
+    assert response["statusCode"] == 200
+    assert ingest == ["upload", "score", "save"]
+
+
+def test_model_is_not_scored_when_upload_fails(ingest, monkeypatch):
+    monkeypatch.setattr(
+        handler,
+        "upload_artifact_to_s3",
+        MagicMock(side_effect=FileDownloadError("gone")),
+    )
+
+    response = _post()
+
+    assert response["statusCode"] == 404
+    assert ingest == []
+
+
+def test_non_model_artifacts_are_not_scored(ingest):
+    response = _post("dataset")
+
+    assert response["statusCode"] == 200
+    assert ingest == ["upload", "save"]
@@ -0,0 +1,413 @@
+import json
+import re
+import threading
+from collections import defaultdict
+
+import pytest
+
+from lambdas import post_search_by_regex as search
+from src.settings import ARTIFACTS_TABLE
+from tests.lambdas.conftest import make_event
+
+
+def _item(artifact_id, name, artifact_type="model", **metadata):
+    """Raw low-level DynamoDB item, as returned by client.scan()."""
+    item = {
+        "artifact_id": {"S": artifact_id},
+        "name": {"S": name},
+        "artifact_type": {"S": artifact_type},
+    }
+    if metadata:
+        item["metadata"] = {
+            "M": {
+                k: {"N": str(v)} if isinstance(v, int) else {"S": v}
+                for k, v in metadata.items()
+            }
+        }
+    return item
+
+
+class FakeDynamoClient:
+    """
+    Low-level DynamoDB client serving parallel-scan pages.
+
+    `pages` maps segment number → list of item pages; pages after the first
+    are reached through LastEvaluatedKey/ExclusiveStartKey.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def scan(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        segment_pages = self.pages.get(kwargs["Segment"], [[]])
+        start = kwargs.get("ExclusiveStartKey")
+        index = 0 if start is None else int(start["page"]["N"])
+
+        items = segment_pages[index]
+        if "metadata" not in kwargs["ProjectionExpression"]:
+            items = [{k: v for k, v in i.items() if k != "metadata"} for i in items]
+
+        response = {"Items": items}
+        if index + 1 < len(segment_pages):
+            response["LastEvaluatedKey"] = {"page": {"N": str(index + 1)}}
+        return response
+
+    def calls_for(self, segment):
+        return [c for c in self.calls if c["Segment"] == segment]
+
+
+@pytest.fixture
+def dynamo(monkeypatch):
+    """Install a FakeDynamoClient; tests fill in `pages` per segment."""
+    client = FakeDynamoClient({})
+    monkeypatch.setattr(search, "get_dynamodb_client", lambda: client)
+    return client
+
+
+# -----------------------------------------------------------------------------
+# Scan
+# -----------------------------------------------------------------------------
+def test_scan_projects_fields_and_filters_type_server_side(dynamo):
+    dynamo.pages = {0: [[_item("1", "bert-base")]], 1: [[_item("2", "gpt2")]]}
+
+    results = search.search_artifacts_by_regex(
+        "bert", artifact_type="model", total_segments=2
+    )
+
+    assert results == [{"name": "bert-base", "id": "1", "type": "model"}]
+    assert sorted(c["Segment"] for c in dynamo.calls) == [0, 1]
+    for call in dynamo.calls:
+        assert call["TableName"] == ARTIFACTS_TABLE
+        assert call["TotalSegments"] == 2
+        assert (
+            call["ProjectionExpression"] == "#n, artifact_id, artifact_type, metadata"
+        )
+        assert call["ExpressionAttributeNames"] == {"#n": "name"}
+        assert call["FilterExpression"] == "artifact_type = :t"
+        assert call["ExpressionAttributeValues"] == {":t": {"S": "model"}}
+        assert "Limit" not in call
+        assert "ExclusiveStartKey" not in call
+
+
+def test_scan_without_type_has_no_filter(dynamo):
+    dynamo.pages = {0: [[_item("1", "bert")]]}
+
+    search.search_artifacts_by_regex("bert", total_segments=1)
+
+    (call,) = dynamo.calls
+    assert "FilterExpression" not in call
+    assert "ExpressionAttributeValues" not in call
+
+
+def test_scan_matches_string_metadata_only_when_requested(dynamo):
+    dynamo.pages = {
+        0: [
+            [
+                _item("1", "model-a", readme="Fine-tuned BERT", downloads=7),
+                _item("2", "model-b", downloads=7),
+            ]
+        ]
+    }
+
+    assert search.search_artifacts_by_regex("bert", total_segments=1) == [
+        {"name": "model-a", "id": "1", "type": "model"}
+    ]
+    assert search.search_artifacts_by_regex("^7$", total_segments=1) == []
+
+    dynamo.calls.clear()
+    assert (
+        search.search_artifacts_by_regex(
+            "bert", total_segments=1, search_metadata=False
+        )
+        == []
+    )
+    assert dynamo.calls[0]["ProjectionExpression"] == "#n, artifact_id, artifact_type"
+
+
+def test_scan_pages_each_segment_with_its_own_start_key(dynamo):
+    dynamo.pages = {
+        0: [[_item("a1", "bert-1")], [_item("a2", "bert-2")], [_item("a3", "x")]],
+        1: [[_item("b1", "bert-3")], [_item("b2", "bert-4")]],
+    }
+
+    results = search.search_artifacts_by_regex("bert", total_segments=2)
+
+    assert sorted(r["id"] for r in results) == ["a1", "a2", "b1", "b2"]
+    assert [c.get("ExclusiveStartKey") for c in dynamo.calls_for(0)] == [
+        None,
+        {"page": {"N": "1"}},
+        {"page": {"N": "2"}},
+    ]
+    assert [c.get("ExclusiveStartKey") for c in dynamo.calls_for(1)] == [
+        None,
+        {"page": {"N": "1"}},
+    ]
+
+
+def test_scan_stops_fetching_pages_once_limit_is_reached(dynamo):
+    dynamo.pages = {0: [[_item(str(i), f"bert-{i}")] for i in range(10)]}
+
+    results = search.search_artifacts_by_regex("bert", limit=2, total_segments=1)
+
+    assert [r["id"] for r in results] == ["0", "1"]
+    assert len(dynamo.calls) == 2
+    assert dynamo.calls[0]["Limit"] == search.MIN_SCAN_PAGE_SIZE
+
+
+def test_scan_page_cap_scales_with_limit(dynamo):
+    dynamo.pages = {0: [[]]}
+
+    search.search_artifacts_by_regex("bert", limit=50, total_segments=1)
+
+    assert dynamo.calls[0]["Limit"] == 50 * search.SCAN_PAGE_FACTOR
+
+
+def test_scan_error_in_one_segment_propagates(dynamo, monkeypatch):
+    def failing_scan(**kwargs):
+        raise RuntimeError("throttled")
+
+    monkeypatch.setattr(dynamo, "scan", failing_scan)
+
+    with pytest.raises(RuntimeError, match="throttled"):
+        search.search_artifacts_by_regex("bert", total_segments=2)
+
+
+# -----------------------------------------------------------------------------
+# Pattern acceptance
+# -----------------------------------------------------------------------------
+@pytest.mark.parametrize(
+    "pattern", [".*bert.*", "(a+)+$", r"(\w+\s?)*x", "(ab){1,3}+", "a" * 300]
+)
+def test_any_valid_pattern_is_accepted(pattern):
+    assert search._get_compiled(pattern).regex.pattern == pattern
+
+
+# -----------------------------------------------------------------------------
+# Required-literal prefilter
+# -----------------------------------------------------------------------------
+def _casefold_prefilter_accepts(pattern, text):
+    folded = text.casefold()
+    return all(lit in folded for lit in search._extract_required_literals(pattern))
+
+
+@pytest.mark.parametrize(
+    "pattern, text",
+    [
+        ("Işık", "ışık"),
+        ("istanbul", "İSTANBUL"),
+        ("DIN", "dın"),
+        ("Straße", "STRASSE straße"),
+        ("bert-base", "BERT-Base-uncased"),
+    ],
+)
+def test_literal_prefilter_never_rejects_an_ignorecase_match(pattern, text):
+    assert re.search(pattern, text, re.IGNORECASE)
+    assert _casefold_prefilter_accepts(pattern, text)
+
+
+def test_extract_required_literals_cuts_runs_at_casefold_unsafe_chars():
+    assert search._extract_required_literals("istanbul") == ["stanbul"]
+    assert search._extract_required_literals("Işık") == ["ş", "k"]
+    assert search._extract_required_literals("bert[-_]base") == ["bert", "base"]
+    assert search._extract_required_literals("a|b") == []
+
+
+def test_casefold_unsafe_covers_every_ignorecase_class_split_by_casefold():
+    sre = pytest.importorskip("_sre")
+    casefix = pytest.importorskip("re._casefix")
+    extra = casefix._EXTRA_CASES
+
+    classes = defaultdict(set)
+    for cp in range(0x20000):
+        ch = chr(cp)
+        if ch.lower() == ch and ch.upper() == ch and cp not in extra:
+            continue
+        lo = sre.unicode_tolower(cp)
+        classes[min((lo,) + extra.get(lo, ()))].add(ch)
+
+    unsafe = {
+        ch
+        for members in classes.values()
+        if len({m.casefold() for m in members}) > 1
+        for ch in members
+    }
+    assert unsafe <= search._CASEFOLD_UNSAFE
+
+
+# -----------------------------------------------------------------------------
+# Hyperscan prefilter (stubbed module)
+# -----------------------------------------------------------------------------
+class _FakeDatabase:
+    """Evaluates the PCRE subset emitted by _to_hyperscan_pattern with `re`."""
+
+    def compile(self, expressions, flags):
+        self.expressions = expressions
+        self.flags = flags
+        text = expressions[0].decode("utf-8")
+        text = re.sub(r"\\x\{([0-9a-f]+)\}", lambda m: f"\\U{int(m[1], 16):08x}", text)
+        # Case variants are spelled out, so compile without IGNORECASE
+        self._regex = re.compile(text.replace("\\z", "\\Z"))
+
+    def scan(self, data, match_event_handler, scratch):
+        if self._regex.search(data.decode("utf-8")):
+            if match_event_handler(0, 0, 0, 0, None):
+                raise _fake_hyperscan.ScanTerminated()
+
+
+class _FakeHyperscanModule:
+    HS_FLAG_UTF8 = 1
+    HS_FLAG_UCP = 2
+    HS_FLAG_SINGLEMATCH = 4
+    HS_FLAG_PREFILTER = 8
+    Database = _FakeDatabase
+
+    class error(Exception):
+        pass
+
+    class ScanTerminated(Exception):
+        pass
+
+    @staticmethod
+    def Scratch(database):
+        return object()
+
+
+_fake_hyperscan = _FakeHyperscanModule()
+
+
+@pytest.fixture
+def fake_hyperscan(monkeypatch):
+    monkeypatch.setattr(search, "hyperscan", _fake_hyperscan)
+    search._REGEX_CACHE.clear()
+    yield _fake_hyperscan
+    search._REGEX_CACHE.clear()
+
+
+def test_hyperscan_receives_translated_pattern_not_python_syntax(fake_hyperscan):
+    compiled = search._get_compiled("xa{,3}y")
+
+    assert compiled.database is not None
+    assert b"{0,3}" in compiled.database.expressions[0]
+    assert compiled.database.flags == [1 | 2 | 4 | 8]
+
+
+@pytest.mark.parametrize(
+    "pattern, text",
+    [
+        ("xa{,3}y", "XAAY"),
+        ("xa{,3}y", "xa{,3}y"),
+        ("bert.*base", "BERT-Base"),
+        ("^gpt-[0-9]+$", "gpt-2"),
+        ("^gpt-[0-9]+$", "gpt-2x"),
+        ("[^a]b", "ab Ab cb"),
+        ("istanbul", "İSTANBUL"),
+        ("kelvin", "\u212aelvin"),
+        ("sun", "\u017fun"),
+        ("[h-l]ub", "İub"),
+        ("a|b+?", "ccc"),
+        ("一", "模型一"),
+    ],
+)
+def test_hyperscan_prefilter_agrees_with_re(fake_hyperscan, pattern, text):
+    compiled = search._get_compiled(pattern)
+    match = search._make_search(compiled.regex, compiled.database, compiled.literals)
+
+    assert compiled.database is not None
+    assert bool(match(text)) == bool(re.search(pattern, text, re.IGNORECASE))
+
+
+@pytest.mark.parametrize(
+    "pattern", [r"\bbert", r"\d+", "(?=a)a", r"(a)\1", "(?s)a.b", "(?-i:a)", "ü"]
+)
+def test_untranslatable_patterns_skip_hyperscan(fake_hyperscan, pattern):
+    assert search._get_compiled(pattern).database is None
+
+
+# -----------------------------------------------------------------------------
+# Handler
+# -----------------------------------------------------------------------------
+def test_handler_forwards_limit_and_search_metadata(monkeypatch):
+    calls = []
+
+    def fake_search(pattern, **kwargs):
+        calls.append((pattern, kwargs))
+        return [{"name": "bert", "id": "1", "type": "model"}]
+
+    monkeypatch.setattr(search, "search_artifacts_by_regex", fake_search)
+    event = make_event({"regex": "bert", "limit": 5, "search_metadata": False})
+
+    response = search.lambda_handler(event, None)
+
+    assert response["statusCode"] == 200
+    assert calls == [
+        (
+            "bert",
+            {"artifact_type": None, "limit": 5, "search_metadata": False},
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [{"limit": 0}, {"limit": "5"}, {"limit": True}, {"search_metadata": "no"}],
+)
+def test_handler_rejects_invalid_limit_and_search_metadata(monkeypatch, extra):
+    monkeypatch.setattr(
+        search, "search_artifacts_by_regex", lambda *a, **k: pytest.fail("scanned")
+    )
+
+    response = search.lambda_handler(make_event({"regex": "bert", **extra}), None)
+
+    assert response["statusCode"] == 400
+
+
+def test_handler_returns_matching_artifacts(dynamo):
+    dynamo.pages = {s: [[]] for s in range(search.SCAN_SEGMENTS)}
+    dynamo.pages[0] = [[_item("1", "bert-base"), _item("2", "gpt2")]]
+
+    response = search.lambda_handler(make_event({"regex": "BERT"}), None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == [
+        {"name": "bert-base", "id": "1", "type": "model"}
+    ]
+
+
+def test_handler_returns_404_when_nothing_matches(dynamo):
+    dynamo.pages = {0: [[_item("1", "gpt2")]]}
+
+    response = search.lambda_handler(make_event({"regex": "bert"}), None)
+
+    assert response["statusCode"] == 404
+
+
+@pytest.mark.parametrize(
+    "body, error_code",
+    [
+        ({}, "INVALID_REQUEST"),
+        ({"regex": ""}, "INVALID_REQUEST"),
+        ({"regex": 5}, "INVALID_REQUEST"),
+        ({"regex": "bert", "artifact_type": "weights"}, "INVALID_ARTIFACT_TYPE"),
+        ({"regex": "(unclosed"}, "INVALID_REGEX"),
+    ],
+)
+def test_handler_rejects_bad_requests(dynamo, body, error_code):
+    response = search.lambda_handler(make_event(body), None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error_code"] == error_code
+    assert dynamo.calls == []
+
+
+def test_handler_rejects_malformed_json(dynamo):
+    event = make_event()
+    event["body"] = "{not json"
+
+    response = search.lambda_handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error_code"] == "INVALID_JSON"
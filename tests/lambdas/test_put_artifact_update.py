@@ -0,0 +1,143 @@
+import inspect
+import json
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from lambdas import put_artifact_update as handler
+from tests.lambdas.conftest import make_event
+
+PATH = {"artifact_type": "model", "id": "abc123"}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    table = MagicMock()
+    table.update_item.return_value = {
+        "Attributes": {
+            "artifact_id": "abc123",
+            "artifact_type": "model",
+            "name": "renamed",
+            "source_url": "https://huggingface.co/org/renamed",
+        }
+    }
+    monkeypatch.setattr(handler, "get_ddb_table", lambda name: table)
+    return table
+
+
+def _condition_failed(item=None):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+    if item is not None:
+        response["Item"] = item
+    return ClientError(response, "UpdateItem")
+
+
+def _put(body, path_params=PATH):
+    return handler.lambda_handler(make_event(body, path_params), None)
+
+
+def test_update_returns_updated_artifact(table):
+    response = _put({"name": "renamed", "ignored": "x"})
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == {
+        "metadata": {"name": "renamed", "id": "abc123", "type": "model"},
+        "data": {"url": "https://huggingface.co/org/renamed"},
+    }
+
+    kwargs = table.update_item.call_args.kwargs
+    assert kwargs["Key"] == {"artifact_id": "abc123"}
+    assert kwargs["UpdateExpression"] == "SET #k0 = :v0"
+    assert kwargs["ExpressionAttributeNames"] == {"#k0": "name"}
+    assert kwargs["ExpressionAttributeValues"] == {":v0": "renamed", ":t": "model"}
+    assert kwargs["ConditionExpression"] == (
+        "attribute_exists(artifact_id) AND artifact_type = :t"
+    )
+    assert kwargs["ReturnValuesOnConditionCheckFailure"] == "ALL_OLD"
+
+
+def test_metadata_is_merged_per_key_with_floats_as_decimal(table):
+    _put({"metadata": {"downloads": 10, "score": 0.75, "tags": [0.5, "nlp"]}})
+
+    kwargs = table.update_item.call_args.kwargs
+    assert kwargs["UpdateExpression"] == (
+        "SET metadata.#mk0 = :mv0, metadata.#mk1 = :mv1, metadata.#mk2 = :mv2"
+    )
+    assert kwargs["ExpressionAttributeNames"] == {
+        "#mk0": "downloads",
+        "#mk1": "score",
+        "#mk2": "tags",
+    }
+    values = kwargs["ExpressionAttributeValues"]
+    assert values[":mv0"] == 10
+    assert values[":mv1"] == Decimal("0.75") and isinstance(values[":mv1"], Decimal)
+    assert values[":mv2"] == [Decimal("0.5"), "nlp"]
+
+
+def test_missing_artifact_returns_404(table):
+    table.update_item.side_effect = _condition_failed()
+
+    response = _put({"name": "renamed"})
+
+    assert response["statusCode"] == 404
+    assert json.loads(response["body"])["error_code"] == "NOT_FOUND"
+
+
+def test_artifact_of_another_type_returns_409(table):
+    table.update_item.side_effect = _condition_failed(
+        {"artifact_id": {"S": "abc123"}, "artifact_type": {"S": "dataset"}}
+    )
+
+    response = _put({"name": "renamed"})
+
+    assert response["statusCode"] == 409
+    assert json.loads(response["body"])["error_code"] == "TYPE_MISMATCH"
+
+
+def test_other_client_errors_are_not_swallowed(table, authorized):
+    table.update_item.side_effect = ClientError(
+        {"Error": {"Code": "ProvisionedThroughputExceededException"}}, "UpdateItem"
+    )
+    undecorated = inspect.unwrap(handler.lambda_handler)
+
+    with pytest.raises(ClientError):
+        undecorated(make_event({"name": "renamed"}, PATH), None, auth=authorized)
+
+
+@pytest.mark.parametrize(
+    "body, path_params, error_code",
+    [
+        ({"name": "x"}, {"artifact_type": "model"}, "INVALID_REQUEST"),
+        ({"name": "x"}, None, "INVALID_REQUEST"),
+        (
+            {"name": "x"},
+            {"artifact_type": "weights", "id": "1"},
+            "INVALID_ARTIFACT_TYPE",
+        ),
+        (["name"], PATH, "INVALID_REQUEST"),
+        ({"name": ""}, PATH, "INVALID_REQUEST"),
+        ({"name": 3}, PATH, "INVALID_REQUEST"),
+        ({"metadata": "x"}, PATH, "INVALID_REQUEST"),
+        ({"metadata": {}}, PATH, "INVALID_REQUEST"),
+        ({"unknown": 1}, PATH, "INVALID_REQUEST"),
+    ],
+)
+def test_invalid_requests_return_400(table, body, path_params, error_code):
+    response = _put(body, path_params)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error_code"] == error_code
+    table.update_item.assert_not_called()
+
+
+def test_malformed_json_returns_400(table):
+    event = make_event(path_params=PATH)
+    event["body"] = "{not json"
+
+    response = handler.lambda_handler(event, None)
+
+    assert response["statusCode"] == 400
+    assert json.loads(response["body"])["error_code"] == "INVALID_JSON"
+    table.update_item.assert_not_called()
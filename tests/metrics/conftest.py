@@ -0,0 +1,21 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def llm_mocks(monkeypatch):
+    """
+    Replace the S3/LLM collaborators of the code quality metric.
+    Tests only set return values on the yielded handles.
+    """
+    import src.metrics.code_quality_metric as m
+
+    load = MagicMock(return_value={})
+    bp = MagicMock(return_value="P")
+    ask = MagicMock(return_value=None)
+    monkeypatch.setattr(m.s3_utils, "load_artifact_files", load)
+    monkeypatch.setattr(m, "build_file_analysis_prompt", bp)
+    monkeypatch.setattr(m, "ask_llm", ask)
+    yield SimpleNamespace(load=load, bp=bp, ask=ask)
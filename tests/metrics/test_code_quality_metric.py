@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock
+
+from src.metrics.code_quality_metric import CodeQualityMetric
+
+
+def _model():
+    model = MagicMock()
+    model.artifact_id = "abc123"
+    model.s3_key = "models/abc123"
+    return model
+
+
+def test_code_quality_metric_scores_from_llm(llm_mocks):
+    llm_mocks.load.return_value = {"a.py": "x = 1"}
+    llm_mocks.ask.return_value = {"code_quality": 0.82}
+
+    assert CodeQualityMetric().score(_model()) == {"code_quality": 0.82}
+
+    llm_mocks.load.assert_called_once_with("abc123", "models/abc123")
+    llm_mocks.bp.assert_called_once_with(
+        "code quality", "code_quality", {"a.py": "x = 1"}
+    )
+    assert llm_mocks.ask.call_args.args == ("P",)
+    assert llm_mocks.ask.call_args.kwargs["return_json"] is True
+    assert llm_mocks.ask.call_args.kwargs["json_schema"]["required"] == ["code_quality"]
+
+
+def test_code_quality_metric_no_files_skips_llm(llm_mocks):
+    assert CodeQualityMetric().score(_model()) == {"code_quality": 0.0}
+    llm_mocks.ask.assert_not_called()
+
+
+def test_code_quality_metric_bad_llm_json(llm_mocks):
+    llm_mocks.load.return_value = {"a.py": "x"}
+
+    assert CodeQualityMetric().score(_model()) == {"code_quality": 0.0}
+
+
+def test_code_quality_metric_clamps_out_of_range_score(llm_mocks):
+    llm_mocks.load.return_value = {"a.py": "x"}
+    llm_mocks.ask.return_value = {"code_quality": 7}
+
+    assert CodeQualityMetric().score(_model()) == {"code_quality": 1.0}
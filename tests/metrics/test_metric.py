@@ -0,0 +1,26 @@
+import asyncio
+import threading
+import time
+
+from src.metrics import Metric, score_all_metrics_async
+
+
+class _SlowMetric(Metric):
+    def __init__(self, value, barrier):
+        self.value = value
+        self.barrier = barrier
+
+    def score(self, model):
+        # Every metric must be running at once for the barrier to release
+        self.barrier.wait(timeout=5)
+        time.sleep(0.01)
+        return {"value": self.value}
+
+
+def test_score_all_metrics_async_runs_concurrently_in_order():
+    barrier = threading.Barrier(3)
+    metrics = [_SlowMetric(v, barrier) for v in (0.1, 0.2, 0.3)]
+
+    results = asyncio.run(score_all_metrics_async(object(), metrics))
+
+    assert results == [{"value": 0.1}, {"value": 0.2}, {"value": 0.3}]
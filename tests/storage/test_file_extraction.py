@@ -0,0 +1,102 @@
+import io
+import tarfile
+
+import pytest
+
+from src.storage.file_extraction import (
+    extract_files_from_tar_stream,
+    extract_relevant_files,
+    is_readme,
+)
+
+
+def _make_tar(path, files):
+    """Write a .tar.gz at path containing {name: bytes} members."""
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("repo/README.md", True),
+        ("readme", True),
+        ("docs/ReadMe.rst", True),
+        ("repo/src/readme_utils.py", True),
+        ("repo/main.py", False),
+    ],
+)
+def test_is_readme(name, expected):
+    assert is_readme(name) is expected
+
+
+def test_extract_skips_non_text_and_prefers_readme(tmp_path):
+    """Only whitelisted extensions are returned, READMEs first."""
+    tar_path = _make_tar(
+        tmp_path / "a.tar.gz",
+        {
+            "repo/b.py": b"print('b')",
+            "repo/a.py": b"print('a')",
+            "repo/model.bin": b"\x00\x01",
+            "repo/README.md": b"# Hello",
+        },
+    )
+
+    files = extract_relevant_files(tar_path)
+
+    assert list(files) == ["repo/README.md", "repo/a.py", "repo/b.py"]
+    assert files["repo/README.md"] == "# Hello"
+
+
+def test_extract_respects_max_files_and_max_chars(tmp_path):
+    """The best-ranked max_files survive and contents are truncated."""
+    tar_path = _make_tar(
+        tmp_path / "b.tar.gz",
+        {
+            "repo/z.py": b"z" * 10,
+            "repo/y.py": b"y" * 10,
+            "repo/README.md": b"r" * 10,
+            "repo/x.py": b"x" * 10,
+        },
+    )
+
+    files = extract_relevant_files(tar_path, max_files=2, max_chars=4)
+
+    assert files == {"repo/README.md": "rrrr", "repo/x.py": "xxxx"}
+
+
+def test_extract_skips_oversized_non_readme(tmp_path):
+    """Large source files are skipped, large READMEs are truncated instead."""
+    tar_path = _make_tar(
+        tmp_path / "c.tar.gz",
+        {
+            "repo/big.py": b"b" * 100,
+            "repo/README.md": b"r" * 100,
+        },
+    )
+
+    files = extract_relevant_files(tar_path, max_chars=10)
+
+    assert files == {"repo/README.md": "r" * 10}
+
+
+def test_extract_from_stream_matches_path_extraction(tmp_path):
+    """Reading from a file-like object gives the same result as from disk."""
+    members = {
+        "repo/b.py": b"print('b')",
+        "repo/README.md": b"# Hello",
+        "repo/model.bin": b"\x00\x01",
+    }
+    tar_path = _make_tar(tmp_path / "d.tar.gz", members)
+
+    with open(tar_path, "rb") as f:
+        stream = io.BytesIO(f.read())
+
+    files = extract_files_from_tar_stream(stream)
+
+    assert files == extract_relevant_files(tar_path)
+    assert list(files) == ["repo/README.md", "repo/b.py"]
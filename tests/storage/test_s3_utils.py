@@ -0,0 +1,119 @@
+import io
+import tarfile
+
+import boto3
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from src.storage import s3_utils
+
+BUCKET = s3_utils.ARTIFACTS_BUCKET
+
+
+def _tar_bytes(files):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _body(data):
+    return {"Body": StreamingBody(io.BytesIO(data), len(data))}
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    """
+    Real botocore S3 client with stubbed responses, so request parameters
+    are validated against the service model.
+    """
+    client = boto3.client(
+        "s3",
+        region_name="us-east-2",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    monkeypatch.setattr(s3_utils, "get_s3", lambda: client)
+    s3_utils.get_artifact_files.cache_clear()
+    with Stubber(client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+    s3_utils.get_artifact_files.cache_clear()
+
+
+def test_load_artifact_files_reuses_extraction_for_same_etag(s3):
+    data = _tar_bytes({"repo/README.md": b"# Hi", "repo/a.py": b"x = 1"})
+    head = {"Bucket": BUCKET, "Key": "models/abc"}
+    s3.add_response("head_object", {"ETag": '"v1"'}, head)
+    s3.add_response("get_object", _body(data), {**head, "IfMatch": '"v1"'})
+    s3.add_response("head_object", {"ETag": '"v1"'}, head)
+
+    first = s3_utils.load_artifact_files("abc", "models/abc")
+    second = s3_utils.load_artifact_files("abc", "models/abc")
+
+    assert first == second == {"repo/README.md": "# Hi", "repo/a.py": "x = 1"}
+    assert first is not second
+
+
+def test_load_artifact_files_redownloads_on_new_etag(s3):
+    data = _tar_bytes({"repo/a.py": b"x = 1"})
+    for etag in ('"v1"', '"v2"'):
+        s3.add_response("head_object", {"ETag": etag})
+        s3.add_response(
+            "get_object",
+            _body(data),
+            {"Bucket": BUCKET, "Key": "models/abc", "IfMatch": etag},
+        )
+
+    s3_utils.load_artifact_files("abc", "models/abc")
+    s3_utils.load_artifact_files("abc", "models/abc")
+
+
+def test_download_artifact_from_s3_streams_with_optional_if_match(s3):
+    key = {"Bucket": BUCKET, "Key": "models/abc"}
+    s3.add_response("get_object", _body(b"one"), key)
+    s3.add_response("get_object", _body(b"two"), {**key, "IfMatch": '"v1"'})
+
+    assert s3_utils.download_artifact_from_s3("abc", "models/abc").read() == b"one"
+    body = s3_utils.download_artifact_from_s3("abc", "models/abc", if_match='"v1"')
+    assert body.read() == b"two"
+
+
+def test_download_artifact_from_s3_to_file_with_if_match(s3, tmp_path):
+    path = tmp_path / "a.tar.gz"
+    s3.add_response(
+        "get_object",
+        _body(b"payload"),
+        {"Bucket": BUCKET, "Key": "models/abc", "IfMatch": '"v1"'},
+    )
+
+    assert (
+        s3_utils.download_artifact_from_s3("abc", "models/abc", str(path), '"v1"')
+        is None
+    )
+    assert path.read_bytes() == b"payload"
+
+
+def test_download_artifact_from_s3_to_file_if_match_mismatch(s3, tmp_path):
+    s3.add_client_error(
+        "get_object", service_error_code="PreconditionFailed", http_status_code=412
+    )
+
+    with pytest.raises(s3_utils.ClientError):
+        s3_utils.download_artifact_from_s3(
+            "abc", "models/abc", str(tmp_path / "a.tar.gz"), '"v1"'
+        )
+    assert not (tmp_path / "a.tar.gz").exists()
+
+
+def test_download_artifact_from_s3_to_file_without_if_match(s3, tmp_path):
+    path = tmp_path / "a.tar.gz"
+    s3.add_response("head_object", {"ContentLength": 7, "ETag": '"v1"'})
+    s3.add_response("get_object", _body(b"payload"))
+
+    assert s3_utils.download_artifact_from_s3("abc", "models/abc", str(path)) is None
+    assert path.read_bytes() == b"payload"
@@ -0,0 +1,95 @@
+import base64
+import json
+
+import pytest
+
+from src.utils.http import (
+    error_response,
+    json_response,
+    parse_json_body,
+    translate_exceptions,
+)
+
+
+# ============================================================
+# error_response tests
+# ============================================================
+def test_error_response_body_is_object():
+    """Error bodies must be JSON objects carrying error + error_code."""
+    resp = error_response(400, "x", "Y")
+
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"]) == {"error": "x", "error_code": "Y"}
+
+
+def test_error_response_without_error_code():
+    """error_code is omitted entirely when not provided."""
+    resp = error_response(404, "missing")
+
+    assert json.loads(resp["body"]) == {"error": "missing"}
+
+
+# ============================================================
+# json_response tests
+# ============================================================
+def test_json_response_serializes_lists_and_strings():
+    """Lists (search results) and raw strings (tokens) are valid bodies."""
+    items = [{"name": "bert", "id": "1", "type": "model"}]
+
+    assert json.loads(json_response(200, items)["body"]) == items
+    assert json.loads(json_response(200, "bearer abc")["body"]) == "bearer abc"
+
+
+def test_json_response_merges_headers():
+    """Custom headers extend (not replace) the default CORS headers."""
+    resp = json_response(200, {}, headers={"X-Test": "1"})
+
+    assert resp["headers"]["X-Test"] == "1"
+    assert resp["headers"]["Content-Type"] == "application/json"
+
+
+# ============================================================
+# parse_json_body tests
+# ============================================================
+@pytest.mark.parametrize("event", [{}, {"body": None}, {"body": ""}])
+def test_parse_json_body_empty(event):
+    """Missing or empty bodies parse as an empty object."""
+    assert parse_json_body(event) == {}
+
+
+def test_parse_json_body_invalid_raises_json_error():
+    """Invalid JSON surfaces as json.JSONDecodeError regardless of backend."""
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_body({"body": "{not json"})
+
+
+def test_parse_json_body_base64():
+    """Base64-encoded bodies are decoded before parsing."""
+    raw = base64.b64encode(b'{"regex": "bert"}').decode()
+    event = {"body": raw, "isBase64Encoded": True}
+
+    assert parse_json_body(event) == {"regex": "bert"}
+
+
+def test_parse_json_body_invalid_base64_raises_json_error():
+    """A corrupt base64 body is reported like any other malformed body."""
+    event = {"body": "not base64!!", "isBase64Encoded": True}
+
+    with pytest.raises(json.JSONDecodeError):
+        parse_json_body(event)
+
+
+# ============================================================
+# translate_exceptions tests
+# ============================================================
+def test_translate_exceptions_returns_500():
+    """Uncaught handler exceptions become a 500 INTERNAL_ERROR response."""
+
+    @translate_exceptions
+    def handler(event, context):
+        raise RuntimeError("boom")
+
+    resp = handler({}, None)
+
+    assert resp["statusCode"] == 500
+    assert json.loads(resp["body"])["error_code"] == "INTERNAL_ERROR"
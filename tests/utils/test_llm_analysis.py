@@ -0,0 +1,364 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ReadTimeoutError
+
+from src.utils import llm_analysis
+from src.utils.llm_analysis import ask_llm
+
+
+def _bedrock_response(text):
+    payload = {"content": [{"type": "text", "text": text}]}
+    return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+
+@pytest.fixture
+def bedrock(monkeypatch):
+    """Replace the Bedrock runtime client with a mock."""
+    client = MagicMock()
+    monkeypatch.setattr(llm_analysis, "_get_bedrock_client", lambda: client)
+    ask_llm.cache_clear()
+    yield client
+    ask_llm.cache_clear()
+
+
+def test_ask_llm_returns_text(bedrock):
+    bedrock.invoke_model.return_value = _bedrock_response("hello")
+
+    assert ask_llm("hi") == "hello"
+
+
+def test_ask_llm_returns_json(bedrock):
+    bedrock.invoke_model.return_value = _bedrock_response('{"score": 0.5}')
+
+    assert ask_llm("hi", return_json=True) == {"score": 0.5}
+
+
+def test_ask_llm_parses_non_ascii_body_bytes(bedrock):
+    body = MagicMock()
+    body.read.return_value = json.dumps(
+        {"content": [{"type": "text", "text": '{"note": "café ✓"}'}]},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    bedrock.invoke_model.return_value = {"body": body}
+
+    assert ask_llm("hi", return_json=True) == {"note": "café ✓"}
+
+
+def test_ask_llm_bad_json_returns_none(bedrock):
+    bedrock.invoke_model.return_value = _bedrock_response("not json")
+
+    assert ask_llm("hi", return_json=True) is None
+
+
+def test_ask_llm_cache_disabled_by_default(bedrock, monkeypatch):
+    monkeypatch.delenv("MODELGUARD_LLM_CACHE", raising=False)
+    bedrock.invoke_model.side_effect = lambda **_: _bedrock_response("x")
+
+    ask_llm("same prompt")
+    ask_llm("same prompt")
+
+    assert bedrock.invoke_model.call_count == 2
+
+
+def test_ask_llm_cache_hit_skips_bedrock(bedrock, monkeypatch):
+    monkeypatch.setenv("MODELGUARD_LLM_CACHE", "1")
+    bedrock.invoke_model.side_effect = lambda **_: _bedrock_response('{"s": 1}')
+
+    first = ask_llm("same prompt", return_json=True)
+    second = ask_llm("same prompt", return_json=True)
+
+    assert first == second == {"s": 1}
+    assert bedrock.invoke_model.call_count == 1
+
+    # return_json is part of the key: the raw-text variant is a separate entry
+    assert ask_llm("same prompt") == '{"s": 1}'
+    assert bedrock.invoke_model.call_count == 2
+
+
+def test_ask_llm_cache_does_not_store_failures(bedrock, monkeypatch):
+    monkeypatch.setenv("MODELGUARD_LLM_CACHE", "1")
+    bedrock.invoke_model.side_effect = lambda **_: _bedrock_response("not json")
+
+    assert ask_llm("p", return_json=True) is None
+    assert ask_llm("p", return_json=True) is None
+    assert bedrock.invoke_model.call_count == 2
+
+
+def test_ask_llm_semantic_cache_hit_skips_model(bedrock, monkeypatch):
+    monkeypatch.delenv("MODELGUARD_LLM_CACHE", raising=False)
+    semantic = MagicMock()
+    semantic.lookup.return_value = {"s": 0.9}
+    monkeypatch.setattr(llm_analysis, "_get_semantic_cache", lambda: semantic)
+    monkeypatch.setattr(llm_analysis, "_embed", lambda text: [0.1, 0.2])
+
+    assert ask_llm("near duplicate", return_json=True) == {"s": 0.9}
+    bedrock.invoke_model.assert_not_called()
+    semantic.add.assert_not_called()
+
+
+def test_ask_llm_semantic_cache_miss_stores_response(bedrock, monkeypatch):
+    monkeypatch.delenv("MODELGUARD_LLM_CACHE", raising=False)
+    semantic = MagicMock()
+    semantic.lookup.return_value = None
+    monkeypatch.setattr(llm_analysis, "_get_semantic_cache", lambda: semantic)
+    monkeypatch.setattr(llm_analysis, "_embed", lambda text: [0.1, 0.2])
+    bedrock.invoke_model.return_value = _bedrock_response("fresh")
+
+    assert ask_llm("new prompt") == "fresh"
+    semantic.add.assert_called_once()
+    assert semantic.add.call_args.args[1:] == ([0.1, 0.2], "fresh")
+
+
+class _FakeEventStream:
+    """Minimal stand-in for botocore's EventStream of streamed text deltas."""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        yield {"chunk": {"bytes": json.dumps({"type": "message_start"}).encode()}}
+        for text in self.texts:
+            self.consumed += 1
+            delta = {"type": "content_block_delta", "delta": {"text": text}}
+            yield {"chunk": {"bytes": json.dumps(delta).encode()}}
+
+    def close(self):
+        self.closed = True
+
+
+def test_ask_llm_streams_json_and_stops_early(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_INFERENCE_PROFILE_ARN", "arn:aws:bedrock:profile")
+    stream = _FakeEventStream(
+        ['Sure: {"code_', 'quality": 0.8, "n": "}"', "}", " extra"]
+    )
+    bedrock.invoke_model_with_response_stream.return_value = {"body": stream}
+
+    result = ask_llm("p", return_json=True)
+
+    assert result == {"code_quality": 0.8, "n": "}"}
+    assert stream.consumed == 3
+    assert stream.closed
+    bedrock.invoke_model.assert_not_called()
+    kwargs = bedrock.invoke_model_with_response_stream.call_args.kwargs
+    assert kwargs["modelId"] == "arn:aws:bedrock:profile"
+
+
+def test_ask_llm_streams_whole_array(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_INFERENCE_PROFILE_ARN", "arn:aws:bedrock:profile")
+    stream = _FakeEventStream(['[{"a": 0.1}, ', '{"b": "]"}', "] trailing", " more"])
+    bedrock.invoke_model_with_response_stream.return_value = {"body": stream}
+
+    result = ask_llm("p", return_json=True)
+
+    assert result == [{"a": 0.1}, {"b": "]"}]
+    assert bedrock.invoke_model_with_response_stream.call_count == 1
+    assert stream.consumed == 3
+    bedrock.invoke_model.assert_not_called()
+
+
+def test_ask_llm_streaming_invalid_json_returns_none(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_INFERENCE_PROFILE_ARN", "arn:aws:bedrock:profile")
+    stream = _FakeEventStream(["not json"])
+    bedrock.invoke_model_with_response_stream.return_value = {"body": stream}
+
+    assert ask_llm("p", return_json=True) is None
+    assert stream.closed
+
+
+def test_ask_llm_text_does_not_stream(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_INFERENCE_PROFILE_ARN", "arn:aws:bedrock:profile")
+    bedrock.invoke_model.return_value = _bedrock_response("hello")
+
+    assert ask_llm("p") == "hello"
+    bedrock.invoke_model_with_response_stream.assert_not_called()
+
+
+def test_build_llm_prompt_layout():
+    prompt = llm_analysis.build_llm_prompt(
+        "  Do the task.  ", {"FILE: a.py": "x = 1", "FILE: b.md": "# B"}
+    )
+
+    assert prompt == (
+        "Do the task.\n\n=== FILE: a.py ===\nx = 1\n\n=== FILE: b.md ===\n# B\n"
+    )
+    assert llm_analysis.build_llm_prompt("Only instructions") == "Only instructions\n"
+
+    pairs = iter([("FILE: a.py", "x = 1"), ("FILE: b.md", "# B")])
+    assert llm_analysis.build_llm_prompt("  Do the task.  ", pairs) == prompt
+
+
+def test_ask_llm_json_schema_uses_forced_tool_call(bedrock):
+    payload = {
+        "content": [
+            {"type": "tool_use", "name": "submit_result", "input": {"score": 0.7}}
+        ]
+    }
+    bedrock.invoke_model.return_value = {
+        "body": io.BytesIO(json.dumps(payload).encode("utf-8"))
+    }
+    schema = llm_analysis.score_schema("score")
+
+    assert ask_llm("p", return_json=True, json_schema=schema) == {"score": 0.7}
+
+    sent = json.loads(bedrock.invoke_model.call_args.kwargs["body"])
+    assert sent["tools"][0]["input_schema"] == schema
+    assert sent["tool_choice"] == {"type": "tool", "name": "submit_result"}
+
+
+def test_ask_llm_json_schema_without_tool_use_returns_none(bedrock):
+    bedrock.invoke_model.return_value = _bedrock_response('{"score": 0.7}')
+
+    schema = llm_analysis.score_schema("score")
+    assert ask_llm("p", return_json=True, json_schema=schema) is None
+
+
+def test_ask_llm_async_delegates_to_ask_llm(bedrock):
+    import asyncio
+
+    bedrock.invoke_model.return_value = _bedrock_response('{"s": 0.4}')
+
+    result = asyncio.run(llm_analysis.ask_llm_async("p", return_json=True))
+
+    assert result == {"s": 0.4}
+
+
+def test_condense_python_strips_comments_docstrings_and_blank_lines():
+    source = (
+        '"""Module doc."""\n'
+        "import os  # why\n"
+        "\n"
+        "# standalone comment\n"
+        "def f(x):\n"
+        '    """Docstring\n'
+        '    spanning lines."""\n'
+        '    s = "# not a comment"\n'
+        "\n"
+        "    return x\n"
+    )
+
+    assert llm_analysis._condense("pkg/mod.py", source) == (
+        'import os\ndef f(x):\n    s = "# not a comment"\n    return x'
+    )
+
+
+def test_condense_js_keeps_comment_markers_inside_strings():
+    source = (
+        'const glob = "src/**/*.ts"; /* real\n'
+        "   comment */\n"
+        "const s = 'it\\'s /* not */';\n"
+        "// whole line\n"
+        "const t = `a /* b */ c`;\n"
+    )
+
+    assert llm_analysis._condense("web/app.ts", source) == (
+        'const glob = "src/**/*.ts";\n'
+        "const s = 'it\\'s /* not */';\n"
+        "const t = `a /* b */ c`;"
+    )
+
+
+def test_condense_drops_generated_files_and_trims_long_ones():
+    assert llm_analysis._condense("web/app.min.js", "var a=1;") == ""
+    assert llm_analysis._condense("poetry.lock", "[[package]]") == ""
+
+    long_text = "h" * 3000 + "t" * 3000
+    condensed = llm_analysis._condense("notes.txt", long_text)
+    assert condensed == "h" * 2048 + "\n...\n" + "t" * 2048
+
+
+def test_minify_for_llm_rewrites_json_prose_and_binaries():
+    minify = llm_analysis._minify_for_llm
+
+    assert minify("config.json", '\ufeff{\r\n  "a": [1, 2],\r\n  "b": "x"\r\n}') == (
+        '{"a":[1,2],"b":"x"}'
+    )
+    assert minify("broken.json", '{"a": ') == '{"a": '
+    assert minify("README.md", "# T\r\n\r\n\r\n\r\nsome    spaced\ttext") == (
+        "# T\n\nsome spaced text"
+    )
+    assert minify("img.txt", "data:" + "QUJD" * 100 + "==") == "data:<base64 elided>"
+    assert minify("weights.bin", "\x00\x01\x02" * 10) == "<binary 30 bytes elided>"
+
+
+def test_minify_for_llm_keeps_code_indentation_in_prose():
+    readme = "Usage:\n\n```python\ndef f():\n    return  1\n```\n"
+
+    assert llm_analysis._minify_for_llm("README.md", readme) == (
+        "Usage:\n\n```python\ndef f():\n    return 1\n```\n"
+    )
+
+
+def test_minify_for_llm_keeps_json_too_deep_to_reencode():
+    deep = "[" * 300 + "]" * 300
+
+    assert llm_analysis._minify_for_llm("deep.json", deep) == deep
+    assert "deep.json" in llm_analysis.build_file_analysis_prompt(
+        "code quality", "code_quality", {"deep.json": deep}
+    )
+
+
+def test_build_file_analysis_prompt_respects_token_budget(monkeypatch):
+    monkeypatch.setattr(llm_analysis, "_count_tokens", len)
+    files = {"README.md": "r" * 50, "big.txt": "b\n" * 250, "small.txt": "s" * 10}
+
+    prompt = llm_analysis.build_file_analysis_prompt(
+        "code quality", "code_quality", files, max_input_tokens=600
+    )
+
+    assert "=== FILE: README.md ===" in prompt
+    assert "=== FILE: small.txt ===" in prompt
+    assert "big.txt" not in prompt
+
+
+def test_ask_llm_stop_sequence_is_restored(bedrock):
+    payload = {
+        "content": [{"type": "text", "text": '{"score": 0.6'}],
+        "stop_reason": "stop_sequence",
+        "stop_sequence": "}",
+    }
+    bedrock.invoke_model.return_value = {
+        "body": io.BytesIO(json.dumps(payload).encode("utf-8"))
+    }
+
+    result = ask_llm("p", max_tokens=32, return_json=True, stop_sequences=["}"])
+
+    assert result == {"score": 0.6}
+    sent = json.loads(bedrock.invoke_model.call_args.kwargs["body"])
+    assert sent["stop_sequences"] == ["}"]
+    assert sent["max_tokens"] == 32
+    assert sent["temperature"] == 0.0
+
+
+def test_ask_llm_streaming_stop_sequence_is_restored(bedrock, monkeypatch):
+    monkeypatch.setenv("BEDROCK_INFERENCE_PROFILE_ARN", "arn:aws:bedrock:profile")
+
+    class _StoppedStream(_FakeEventStream):
+        def __iter__(self):
+            yield from super().__iter__()
+            delta = {
+                "type": "message_delta",
+                "delta": {"stop_reason": "stop_sequence", "stop_sequence": "}"},
+            }
+            yield {"chunk": {"bytes": json.dumps(delta).encode()}}
+
+    stream = _StoppedStream(['{"score": ', "0.6"])
+    bedrock.invoke_model_with_response_stream.return_value = {"body": stream}
+
+    assert ask_llm("p", return_json=True, stop_sequences=["}"]) == {"score": 0.6}
+
+
+def test_ask_llm_read_timeout_returns_none(bedrock):
+    bedrock.invoke_model.side_effect = ReadTimeoutError(endpoint_url="https://bedrock")
+
+    assert ask_llm("hi", return_json=True) is None
+
+
+def test_embed_read_timeout_returns_none(bedrock):
+    bedrock.invoke_model.side_effect = ReadTimeoutError(endpoint_url="https://bedrock")
+
+    assert llm_analysis._embed("hi") is None
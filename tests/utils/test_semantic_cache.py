@@ -0,0 +1,83 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.semantic_cache import SemanticCache  # noqa: E402
+
+
+def test_lookup_hits_similar_embedding():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("v", [1.0, 0.0, 0.0], {"score": 0.7})
+
+    assert cache.lookup("v", [0.99, 0.05, 0.0]) == {"score": 0.7}
+
+
+def test_lookup_misses_dissimilar_embedding_and_other_variant():
+    cache = SemanticCache(threshold=0.9)
+    cache.add("v", [1.0, 0.0, 0.0], "a")
+
+    assert cache.lookup("v", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("other", [1.0, 0.0, 0.0]) is None
+
+
+def test_lookup_returns_most_similar_entry():
+    cache = SemanticCache(threshold=0.5)
+    cache.add("v", [1.0, 0.0], "x")
+    cache.add("v", [0.0, 1.0], "y")
+
+    assert cache.lookup("v", [0.2, 0.9]) == "y"
+
+
+def test_cache_persists_to_directory(tmp_path):
+    cache = SemanticCache(threshold=0.9, cache_dir=str(tmp_path))
+    cache.add("v1", [1.0, 0.0], {"score": 1.0})
+    cache.add("v2", [0.0, 1.0], "text")
+
+    reloaded = SemanticCache(threshold=0.9, cache_dir=str(tmp_path))
+
+    assert len(reloaded) == 2
+    assert reloaded.lookup("v1", [1.0, 0.0]) == {"score": 1.0}
+    assert reloaded.lookup("v2", [0.0, 1.0]) == "text"
+
+
+def test_oldest_entries_are_evicted_past_max_entries():
+    cache = SemanticCache(threshold=0.99, max_entries=2)
+    cache.add("v1", [1.0, 0.0, 0.0], "a")
+    cache.add("v2", [0.0, 1.0, 0.0], "b")
+    cache.add("v2", [0.0, 0.0, 1.0], "c")
+
+    assert len(cache) == 2
+    assert cache.lookup("v1", [1.0, 0.0, 0.0]) is None
+    assert cache.lookup("v2", [0.0, 1.0, 0.0]) == "b"
+
+    cache.add("v1", [1.0, 0.0, 0.0], "d")
+
+    assert cache.lookup("v2", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("v2", [0.0, 0.0, 1.0]) == "c"
+    assert cache.lookup("v1", [1.0, 0.0, 0.0]) == "d"
+
+
+def test_reload_keeps_only_newest_max_entries(tmp_path):
+    cache = SemanticCache(threshold=0.99, cache_dir=str(tmp_path))
+    for i, vector in enumerate(([1.0, 0.0], [0.0, 1.0], [1.0, 1.0])):
+        cache.add("v", vector, i)
+
+    reloaded = SemanticCache(threshold=0.99, cache_dir=str(tmp_path), max_entries=2)
+
+    assert len(reloaded) == 2
+    assert reloaded.lookup("v", [1.0, 0.0]) is None
+    assert reloaded.lookup("v", [1.0, 1.0]) == 2
+
+
+@pytest.mark.parametrize("bad_line", ['{"variant": "v"}', "[1, 2]"])
+def test_malformed_entries_file_is_ignored(tmp_path, bad_line):
+    cache = SemanticCache(threshold=0.9, cache_dir=str(tmp_path))
+    cache.add("v", [1.0, 0.0], "a")
+    cache.add("v", [0.0, 1.0], "b")
+    entries = tmp_path / "entries.jsonl"
+    entries.write_text(entries.read_text().splitlines()[0] + "\n" + bad_line + "\n")
+
+    reloaded = SemanticCache(threshold=0.9, cache_dir=str(tmp_path))
+
+    assert len(reloaded) == 0
+    assert reloaded.lookup("v", [1.0, 0.0]) is None